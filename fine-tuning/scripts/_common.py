@@ -0,0 +1,242 @@
+"""
+Shared Helpers for DocIntel Training / Export Scripts
+======================================================
+
+Config resolution and ONNX export helpers shared by ``merge_adapter.py`` and
+``export_onnx.py``.
+
+Usage:
+    from _common import export_onnx_from_dir, resolve_config, resolve_export_options
+
+    config_path, cfg = resolve_config(args.config)
+    export_opts = resolve_export_options(cfg.get("export", {}))
+    export_onnx_from_dir(model_dir, onnx_dir, export_opts)
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # libyaml not available — fall back to the pure-Python loader
+    from yaml import SafeLoader as _YamlLoader
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+# Resolved once at import; every script reuses it instead of re-resolving.
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CONFIG_PATH = PROJECT_ROOT / "configs" / "training_config.yaml"
+
+# Parsed configs are pickled here, keyed on path + mtime + size.
+CONFIG_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "docintel"
+
+# ---------------------------------------------------------------------------
+# Config loading
+# ---------------------------------------------------------------------------
+
+
+def load_config(config_path: str | Path) -> dict[str, Any]:
+    """Load and return the YAML training configuration.
+
+    The parsed dict is cached as a pickle in ``CONFIG_CACHE_DIR`` keyed on the
+    file's resolved path, mtime and size, so repeated runs against an unchanged
+    config skip YAML parsing entirely.  Any cache failure falls back to parsing;
+    an unreadable cache file is removed so the next run rewrites it.
+    """
+    st = os.stat(config_path)
+    path_key = hashlib.sha1(str(Path(config_path).resolve()).encode()).hexdigest()
+    cache_path = CONFIG_CACHE_DIR / f"{path_key}-{st.st_mtime_ns}-{st.st_size}.pkl"
+
+    try:
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except Exception:  # corrupt/truncated pickle raises a wide range of errors
+        with contextlib.suppress(OSError):
+            cache_path.unlink(missing_ok=True)
+
+    with open(config_path, "r") as f:
+        cfg = yaml.load(f, Loader=_YamlLoader)
+
+    # Write-then-rename so a concurrent reader never sees a partial pickle.
+    tmp_name = None
+    try:
+        CONFIG_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("wb", dir=CONFIG_CACHE_DIR, delete=False) as tmp:
+            tmp_name = tmp.name
+            pickle.dump(cfg, tmp, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, cache_path)
+    except Exception:
+        if tmp_name is not None:
+            with contextlib.suppress(OSError):
+                Path(tmp_name).unlink(missing_ok=True)
+    return cfg
+
+
+@functools.lru_cache(maxsize=4)
+def _load_config_cached(resolved_path: str) -> dict[str, Any]:
+    return load_config(resolved_path)
+
+
+def resolve_config(cli_path: str | None) -> tuple[Path, dict[str, Any]]:
+    """Resolve the ``--config`` argument and return ``(config_path, cfg)``.
+
+    Falls back to ``configs/training_config.yaml`` when *cli_path* is None.
+    The parsed config is memoised per resolved path so a driver calling
+    several entrypoints in-process parses it once.  Callers must treat the
+    returned dict as read-only.
+
+    Exits with status 1 if the config file does not exist.
+    """
+    config_path = Path(cli_path).resolve() if cli_path else DEFAULT_CONFIG_PATH
+
+    if not config_path.exists():
+        print(f"ERROR: config file not found: {config_path}", file=sys.stderr)
+        sys.exit(1)
+
+    return config_path, _load_config_cached(str(config_path))
+
+
+# ---------------------------------------------------------------------------
+# Export options
+# ---------------------------------------------------------------------------
+
+
+def resolve_export_options(
+    export_cfg: dict[str, Any],
+    opset: int | None = None,
+    device: str | None = None,
+    optimize: str | None = None,
+    quantize: str | None = None,
+) -> dict[str, Any]:
+    """Resolve ONNX export options from CLI overrides and the ``export`` config.
+
+    Returns a dict with ``task``, ``opset``, ``device``, ``optimize``, ``fp16``
+    and ``quantize``.  Warns on a cache-less task or an opset older than 17,
+    and exits with status 1 when ``optimize`` is O4 without a CUDA device or
+    ``quantize`` is set for a non-CPU export.
+    """
+    opset = opset or export_cfg.get("opset", 18)
+    device = device or export_cfg.get("device", "cpu")
+    optimize = optimize or export_cfg.get("optimize") or ("O4" if device == "cuda" else "O2")
+    task = export_cfg.get("task", "text-generation-with-past")
+    quantize = quantize or export_cfg.get("quantize") or "none"
+
+    if task == "text-generation":
+        print(
+            "WARNING: task 'text-generation' exports no KV-cache; every decode step will "
+            "recompute attention over the full sequence. Use 'text-generation-with-past'.",
+            file=sys.stderr,
+        )
+
+    if opset < 17:
+        print(
+            f"WARNING: opset {opset} predates fused LayerNorm/attention export; "
+            "the graph will use the unfused decomposition. Use opset 17 or newer.",
+            file=sys.stderr,
+        )
+    if optimize == "O4" and device != "cuda":
+        print("ERROR: --optimize O4 requires --device cuda", file=sys.stderr)
+        sys.exit(1)
+    if quantize != "none" and device != "cpu":
+        print("ERROR: --quantize targets CPU inference; export with --device cpu", file=sys.stderr)
+        sys.exit(1)
+
+    return {
+        "task": task,
+        "opset": opset,
+        "device": device,
+        "optimize": optimize,
+        "fp16": device == "cuda",
+        "quantize": quantize,
+    }
+
+
+def print_export_options(opts: dict[str, Any]) -> None:
+    """Print the resolved export options as an indented summary block."""
+    print(f"  Task  : {opts['task']}")
+    print(f"  Opset : {opts['opset']}")
+    print(f"  Device: {opts['device']} ({'fp16' if opts['fp16'] else 'fp32'})")
+    print(f"  Optim : {opts['optimize']}")
+    print(f"  Quant : {opts['quantize']}")
+
+
+def export_onnx_from_dir(model_dir: str, onnx_dir: str, opts: dict[str, Any]) -> None:
+    """Export the HuggingFace checkpoint in *model_dir* to ONNX in *onnx_dir*.
+
+    Runs optimum's ``main_export`` with the resolved *opts*, then the optional
+    INT8 quantisation step.
+    """
+    # Deferred: importing optimum pulls in torch, which is wasted on --help and
+    # on the argument/path error exits of the calling scripts.
+    from optimum.exporters.onnx import main_export
+
+    main_export(
+        model_name_or_path=model_dir,
+        output=onnx_dir,
+        task=opts["task"],
+        opset=opts["opset"],
+        optimize=opts["optimize"],
+        device=opts["device"],
+        fp16=opts["fp16"],
+        legacy=False,
+        no_post_process=False,
+    )
+    print(f"ONNX model exported to {onnx_dir}")
+    quantize_exported(onnx_dir, opts)
+
+
+def quantize_exported(onnx_dir: str, opts: dict[str, Any]) -> None:
+    """Apply the INT8 dynamic quantisation selected by ``opts["quantize"]``, if any."""
+    if opts["quantize"] == "none":
+        return
+    print(f"Applying INT8 dynamic quantisation ({opts['quantize']}) …")
+    for quantized_path in quantize_dynamic_int8(onnx_dir, opts["quantize"]):
+        print(f"  Quantised: {quantized_path}")
+
+
+def quantize_dynamic_int8(onnx_dir: str, target: str) -> list[Path]:
+    """Apply INT8 dynamic quantisation to every ONNX graph in *onnx_dir*.
+
+    Uses ``optimum.onnxruntime.ORTQuantizer`` with the
+    ``AutoQuantizationConfig`` preset named by *target* (e.g. ``avx512_vnni``).
+    Quantised graphs are written next to the originals with a ``_quantized``
+    suffix.  Returns the paths of the quantised files.
+    """
+    from optimum.onnxruntime import ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+    qconfig = getattr(AutoQuantizationConfig, target)(
+        is_static=False,
+        per_channel=False,
+        operators_to_quantize=["MatMul", "Add", "Attention"],
+    )
+
+    onnx_files = [
+        p for p in sorted(Path(onnx_dir).glob("*.onnx")) if not p.stem.endswith("_quantized")
+    ]
+    quantized: list[Path] = []
+    for onnx_file in onnx_files:
+        quantizer = ORTQuantizer.from_pretrained(onnx_dir, file_name=onnx_file.name)
+        quantized.append(
+            quantizer.quantize(
+                save_dir=onnx_dir,
+                quantization_config=qconfig,
+                file_suffix="quantized",
+            )
+        )
+    return quantized
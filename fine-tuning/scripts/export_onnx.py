@@ -11,7 +11,10 @@ Usage:
         [--model_dir <path/to/merged_model>] \
         [--output_dir <path/to/onnx_model>] \
         [--config path/to/config.yaml] \
-        [--opset <17>]
+        [--opset <18>] \
+        [--device {cpu,cuda}] \
+        [--optimize {O1,O2,O3,O4}] \
+        [--quantize {none,avx2,avx512,avx512_vnni,arm64}]
 """
 
 from __future__ import annotations
@@ -20,14 +23,15 @@ import argparse
 import sys
 from pathlib import Path
 
-import yaml
-from optimum.exporters.onnx import main_export
-
-
-def load_config(config_path: str) -> dict:
-    """Load and return the YAML training configuration."""
-    with open(config_path, "r") as f:
-        return yaml.safe_load(f)
+# Allow importing _common.py from the same directory
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from _common import (
+    PROJECT_ROOT,
+    export_onnx_from_dir,
+    print_export_options,
+    resolve_config,
+    resolve_export_options,
+)
 
 
 def main() -> None:
@@ -54,49 +58,64 @@ def main() -> None:
         "--opset",
         type=int,
         default=None,
-        help="ONNX opset version (default: from config or 17)",
+        help="ONNX opset version; 17+ keeps fused attention/LayerNorm ops (default: from "
+        "config or 18)",
+    )
+    parser.add_argument(
+        "--device",
+        type=str,
+        choices=["cpu", "cuda"],
+        default=None,
+        help="Device used for export; cuda also emits FP16 weights (default: from config or cpu)",
+    )
+    parser.add_argument(
+        "--optimize",
+        type=str,
+        choices=["O1", "O2", "O3", "O4"],
+        default=None,
+        help="ONNX Runtime graph optimization level (default: from config, else O4 on cuda, "
+        "O2 on cpu)",
+    )
+    parser.add_argument(
+        "--quantize",
+        type=str,
+        choices=["none", "avx2", "avx512", "avx512_vnni", "arm64"],
+        default=None,
+        help="Apply INT8 dynamic quantisation for the given CPU target after export "
+        "(default: from config or none)",
     )
     args = parser.parse_args()
 
     # Resolve paths.
-    project_root = Path(__file__).resolve().parent.parent
-    config_path = args.config or str(project_root / "configs" / "training_config.yaml")
-
-    if not Path(config_path).exists():
-        print(f"ERROR: config file not found: {config_path}", file=sys.stderr)
-        sys.exit(1)
-
-    cfg = load_config(config_path)
+    _, cfg = resolve_config(args.config)
     export_cfg = cfg.get("export", {})
 
     model_dir = args.model_dir or str(
-        project_root / export_cfg.get("merged_model_dir", "./merged_model")
+        PROJECT_ROOT / export_cfg.get("merged_model_dir", "./merged_model")
     )
     output_dir = args.output_dir or str(
-        project_root / export_cfg.get("onnx_output_dir", "./onnx_model")
+        PROJECT_ROOT / export_cfg.get("onnx_output_dir", "./onnx_model")
+    )
+    opts = resolve_export_options(
+        export_cfg,
+        opset=args.opset,
+        device=args.device,
+        optimize=args.optimize,
+        quantize=args.quantize,
     )
-    opset = args.opset or export_cfg.get("opset", 17)
 
     if not Path(model_dir).exists():
         print(f"ERROR: merged model directory not found: {model_dir}", file=sys.stderr)
         sys.exit(1)
 
     # ------------------------------------------------------------------
-    # Export to ONNX
+    # Export to ONNX (+ optional INT8 dynamic quantisation)
     # ------------------------------------------------------------------
     print(f"Exporting model from {model_dir}")
-    print(f"  Task  : text-generation")
-    print(f"  Opset : {opset}")
+    print_export_options(opts)
     print(f"  Output: {output_dir}")
+    export_onnx_from_dir(model_dir, output_dir, opts)
 
-    main_export(
-        model_name_or_path=model_dir,
-        output=output_dir,
-        task="text-generation",
-        opset=opset,
-    )
-
-    print(f"ONNX model exported to {output_dir}")
     print("Done.")
 
 
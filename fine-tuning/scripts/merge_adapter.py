@@ -3,13 +3,20 @@ DocIntel LoRA Adapter Merge Script
 ===================================
 
 Merges a trained LoRA adapter back into the base model and saves a full
-16-bit checkpoint ready for ONNX export or direct inference.
+16-bit checkpoint ready for ONNX export or direct inference.  With
+``--load_in_4bit`` the base is kept at training-time 4-bit precision and the
+merged model is saved as 4-bit, for int4 runtimes only.  With
+``--export_onnx`` the in-memory merged model is exported straight to ONNX,
+skipping the reload that ``export_onnx.py`` would otherwise do.
 
 Usage:
     python training/scripts/merge_adapter.py \
         --adapter_dir <path/to/adapter> \
         [--config path/to/config.yaml] \
-        [--output_dir <path/to/merged_model>]
+        [--output_dir <path/to/merged_model>] \
+        [--load_in_4bit] \
+        [--export_onnx [<path/to/onnx_model>]] \
+        [--force]
 """
 
 from __future__ import annotations
@@ -18,14 +25,47 @@ import argparse
 import sys
 from pathlib import Path
 
-import yaml
-from unsloth import FastLanguageModel
-
-
-def load_config(config_path: str) -> dict:
-    """Load and return the YAML training configuration."""
-    with open(config_path, "r") as f:
-        return yaml.safe_load(f)
+# Allow importing _common.py from the same directory
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from _common import (
+    PROJECT_ROOT,
+    export_onnx_from_dir,
+    print_export_options,
+    quantize_exported,
+    resolve_config,
+    resolve_export_options,
+)
+
+# Written into the output directory after a successful save; holds the save method.
+MERGE_MARKER = ".merge_save_method"
+
+
+def is_merge_fresh(adapter_dir: str, output_dir: str, save_method: str) -> bool:
+    """Return True if *output_dir* holds a *save_method* merge newer than *adapter_dir*.
+
+    Compares the newest file mtime under the adapter directory with the mtime
+    of the merged ``config.json``; the merge is also treated as stale when no
+    weight files were written (e.g. an interrupted previous run) or when the
+    ``MERGE_MARKER`` file is missing or records a different save method.
+    """
+    merged_config = Path(output_dir, "config.json")
+    if not merged_config.exists():
+        return False
+    try:
+        if Path(output_dir, MERGE_MARKER).read_text().strip() != save_method:
+            return False
+    except OSError:
+        return False
+    if not any(Path(output_dir).glob("*.safetensors")) and not any(
+        Path(output_dir).glob("*.bin")
+    ):
+        return False
+
+    adapter_mtime = max(
+        (p.stat().st_mtime for p in Path(adapter_dir).rglob("*") if p.is_file()),
+        default=0.0,
+    )
+    return merged_config.stat().st_mtime >= adapter_mtime
 
 
 def main() -> None:
@@ -48,49 +88,141 @@ def main() -> None:
         default=None,
         help="Output directory for merged model (default: from config or ./merged_model)",
     )
+    parser.add_argument(
+        "--load_in_4bit",
+        action="store_true",
+        help="Load the base in 4-bit and save with merged_4bit_forced. Halves merge VRAM, "
+        "but saving and merging to 4 bits might degrade performance; only use it when "
+        "the target runtime is int4 (default: load full precision, save merged_16bit)",
+    )
+    parser.add_argument(
+        "--export_onnx",
+        type=str,
+        nargs="?",
+        const="",
+        default=None,
+        help="After merging, export the in-memory model to ONNX in this directory "
+        "(default when given without a value: export.onnx_output_dir from config)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-run the merge even if the output is newer than the adapter",
+    )
     args = parser.parse_args()
 
     # Resolve paths.
-    project_root = Path(__file__).resolve().parent.parent
-    config_path = args.config or str(project_root / "configs" / "training_config.yaml")
-
-    if not Path(config_path).exists():
-        print(f"ERROR: config file not found: {config_path}", file=sys.stderr)
-        sys.exit(1)
+    _, cfg = resolve_config(args.config)
     if not Path(args.adapter_dir).exists():
         print(f"ERROR: adapter directory not found: {args.adapter_dir}", file=sys.stderr)
         sys.exit(1)
 
-    cfg = load_config(config_path)
     model_cfg = cfg["model"]
     export_cfg = cfg.get("export", {})
 
     output_dir = args.output_dir or str(
-        project_root / export_cfg.get("merged_model_dir", "./merged_model")
+        PROJECT_ROOT / export_cfg.get("merged_model_dir", "./merged_model")
     )
 
+    export_opts = None
+    if args.export_onnx is not None:
+        if args.load_in_4bit:
+            print(
+                "ERROR: --export_onnx requires a 16-bit merge; drop --load_in_4bit",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+        # Resolved and validated up front so a bad export config fails before the merge.
+        export_opts = resolve_export_options(export_cfg)
+        onnx_dir = args.export_onnx or str(
+            PROJECT_ROOT / export_cfg.get("onnx_output_dir", "./onnx_model")
+        )
+
+    save_method = "merged_4bit_forced" if args.load_in_4bit else "merged_16bit"
+
+    if not args.force and is_merge_fresh(args.adapter_dir, output_dir, save_method):
+        print(f"Merged model in {output_dir} is up to date with {args.adapter_dir}; skipping.")
+        if export_opts is not None:
+            # Nothing in memory to hand over; export from the merged checkpoint on disk.
+            print(f"Exporting {output_dir} to ONNX in {onnx_dir}")
+            print_export_options(export_opts)
+            export_onnx_from_dir(output_dir, onnx_dir, export_opts)
+        else:
+            print("Use --force to merge again, or run export_onnx.py on the existing output.")
+        print("Done.")
+        return
+
     # ------------------------------------------------------------------
     # Load base model + adapter
     # ------------------------------------------------------------------
+    load_kwargs: dict = {}
+    if model_cfg.get("low_mem_merge", True):
+        # Stream shards through Accelerate's meta-device path so peak host RAM
+        # stays near 1x model size instead of 2x during materialisation.
+        load_kwargs["low_cpu_mem_usage"] = True
+        # A dispatched (split or offloaded) model cannot be traced for ONNX.
+        if export_opts is None:
+            load_kwargs["device_map"] = "auto"
+
+    # Deferred: importing unsloth initialises torch/CUDA, which is wasted on
+    # --help, the path error exits and the up-to-date early return above.
+    from unsloth import FastLanguageModel
+
     print(f"Loading base model with adapter from {args.adapter_dir}")
     model, tokenizer = FastLanguageModel.from_pretrained(
         model_name=args.adapter_dir,
         max_seq_length=model_cfg["max_seq_length"],
         dtype=model_cfg.get("dtype"),
-        load_in_4bit=False,  # load in full precision for merging
+        load_in_4bit=args.load_in_4bit,
+        **load_kwargs,
     )
 
     # ------------------------------------------------------------------
     # Merge and save
     # ------------------------------------------------------------------
-    print(f"Merging adapter and saving 16-bit model to {output_dir}")
+    # Drop the marker first so an interrupted save is never mistaken for fresh.
+    marker = Path(output_dir, MERGE_MARKER)
+    marker.unlink(missing_ok=True)
+    print(f"Merging adapter and saving model to {output_dir} ({save_method})")
     model.save_pretrained_merged(
         output_dir,
         tokenizer,
-        save_method="merged_16bit",
+        save_method=save_method,
     )
+    marker.write_text(save_method + "\n")
 
     print(f"Merged model saved to {output_dir}")
+
+    # ------------------------------------------------------------------
+    # Optional in-process ONNX export
+    # ------------------------------------------------------------------
+    if export_opts is not None:
+        import torch
+        from optimum.exporters.onnx import onnx_export_from_model
+
+        # save_pretrained_merged writes a merged copy but leaves the in-memory
+        # model wrapped in LoRA layers; fold them in, then match the device and
+        # dtype main_export would load the checkpoint with.
+        merged_model = model.merge_and_unload().to(
+            export_opts["device"],
+            dtype=torch.float16 if export_opts["fp16"] else torch.float32,
+        )
+
+        print(f"Exporting merged model to ONNX in {onnx_dir}")
+        print_export_options(export_opts)
+        onnx_export_from_model(
+            model=merged_model,
+            output=onnx_dir,
+            task=export_opts["task"],
+            opset=export_opts["opset"],
+            optimize=export_opts["optimize"],
+            device=export_opts["device"],
+            legacy=False,
+            preprocessors=[tokenizer],
+        )
+        print(f"ONNX model exported to {onnx_dir}")
+        quantize_exported(onnx_dir, export_opts)
+
     print("Done.")
 
 
@@ -11,30 +11,50 @@ Usage:
     python fine-tuning/scripts/prepare_contracts.py                     # Full CUAD + synthetic
     python fine-tuning/scripts/prepare_contracts.py --synthetic-only     # Synthetic only
     python fine-tuning/scripts/prepare_contracts.py --dry-run            # Small sample (100)
+    python fine-tuning/scripts/prepare_contracts.py --workers 4          # Limit worker processes
 """
 
 from __future__ import annotations
 
 import argparse
+import dataclasses
+import functools
+import hashlib
 import json
+import multiprocessing
+import os
 import random
+import shutil
 import sys
+import tempfile
+from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING, TextIO
 
-from faker import Faker
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
 
 # Allow importing shared.py from the same directory
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 from shared import (
     DATASETS_DIR,
     add_seed_argument,
-    estimate_tokens,
+    derive_task_seed,
+    dump_json_indented,
+    estimate_conversation_tokens,
     load_json_schema,
     make_conversation,
-    save_dataset,
+    save_dataset_from_jsonl,
     setup_logging,
 )
 
+if TYPE_CHECKING:
+    # Faker's provider discovery costs ~70 ms, so it is only imported at
+    # runtime by the functions that build Faker instances — not for --help.
+    from faker import Faker
+
 logger = setup_logging("prepare_contracts")
 
 # ---------------------------------------------------------------------------
@@ -201,19 +221,299 @@ def cuad_category_to_clause_type(category: str) -> str | None:
     return CUAD_CATEGORY_MAP.get(category)
 
 
+# CUAD_CATEGORY_MAP with the category names lower-cased once at import.
+CUAD_CATEGORY_MAP_LOWER: tuple[tuple[str, str], ...] = tuple(
+    (category.lower(), clause_type) for category, clause_type in CUAD_CATEGORY_MAP.items()
+)
+
+
+@functools.lru_cache(maxsize=256)
+def cuad_question_to_clause_type(question: str) -> str | None:
+    """Map a CUAD question to the clause type of the first category it names.
+
+    "First" follows ``CUAD_CATEGORY_MAP`` order.  The question is lower-cased
+    once; each category test is then a plain C substring search.  CUAD asks
+    the same ~41 templated questions of every contract, so results are
+    memoised and the scan runs once per distinct question.
+    """
+    question_lower = question.lower()
+    for category, clause_type in CUAD_CATEGORY_MAP_LOWER:
+        if category in question_lower:
+            return clause_type
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Data classes
+# ---------------------------------------------------------------------------
+
+
+@dataclass(slots=True)
+class StructuredOutput:
+    """The assistant's contract extraction, in contract-schema key order.
+
+    Slotted, so each in-flight example skips a per-instance ``__dict__``.
+    Field order is the serialized key order.
+    """
+
+    document_type: str
+    parties: list[dict]
+    effective_date: str
+    expiration_date: str
+    key_clauses: list[dict]
+    obligations: list[dict]
+    summary: str
+
+
+# ---------------------------------------------------------------------------
+# JSON emission
+# ---------------------------------------------------------------------------
+
+
+def dump_structured_output(structured_output: StructuredOutput) -> str:
+    """Serialize the assistant response as 2-space indented JSON.
+
+    orjson serializes the slotted dataclass directly; without it the response
+    goes through ``dataclasses.asdict`` and ``shared.dump_json_indented``.
+    """
+    if orjson is not None:
+        return orjson.dumps(structured_output, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return dump_json_indented(dataclasses.asdict(structured_output))
+
+
+# ---------------------------------------------------------------------------
+# Faker value pools
+# ---------------------------------------------------------------------------
+
+# Faker's company/bs/city providers spend most of their time in regex
+# substitution.  Values are generated once per process into these pools and
+# then drawn with ``rng.choice``.  States come straight from ``US_STATES``,
+# which is the same list Faker's ``state()`` samples from.
+FAKER_POOL_SIZE = 10_000
+
+COMPANY_POOL: tuple[str, ...] = ()
+BS_POOL: tuple[str, ...] = ()
+CITY_POOL: tuple[str, ...] = ()
+
+
+def build_faker_pools(seed: int, size: int = FAKER_POOL_SIZE) -> None:
+    """Fill the module-level Faker pools deterministically from *seed*."""
+    from faker import Faker
+
+    global COMPANY_POOL, BS_POOL, CITY_POOL
+    fake = Faker()
+    fake.seed_instance(seed)
+    COMPANY_POOL = tuple(fake.company() for _ in range(size))
+    BS_POOL = tuple(fake.bs() for _ in range(size))
+    CITY_POOL = tuple(fake.city() for _ in range(size))
+
+
 # ---------------------------------------------------------------------------
 # Synthetic contract generation
 # ---------------------------------------------------------------------------
 
 
+# Clause templates keyed by clause type.  Identity placeholders
+# (``company_a``, ``company_a_upper``, ``company_b``, ``company_b_upper``,
+# ``state``) are always supplied; every other placeholder is drawn on demand
+# by ``_ClauseFields``, so only the chosen template's values are sampled.
+CLAUSE_TEMPLATES: dict[str, tuple[str, ...]] = {
+    "limitation_of_liability": (
+        (
+            "LIMITATION OF LIABILITY. IN NO EVENT SHALL {company_a_upper} BE LIABLE TO "
+            "{company_b_upper} FOR ANY INDIRECT, INCIDENTAL, SPECIAL, CONSEQUENTIAL, OR "
+            "PUNITIVE DAMAGES, REGARDLESS OF THE CAUSE OF ACTION OR THE THEORY OF LIABILITY, "
+            "EVEN IF {company_a_upper} HAS BEEN ADVISED OF THE POSSIBILITY OF SUCH DAMAGES. "
+            "THE TOTAL AGGREGATE LIABILITY OF {company_a_upper} UNDER THIS AGREEMENT SHALL "
+            "NOT EXCEED THE TOTAL FEES PAID BY {company_b_upper} DURING THE TWELVE (12) "
+            "MONTH PERIOD PRECEDING THE EVENT GIVING RISE TO THE CLAIM."
+        ),
+        (
+            "Liability Cap. The maximum aggregate liability of either party arising out of or "
+            "related to this Agreement shall not exceed the greater of (a) the amounts paid or "
+            "payable under this Agreement during the twelve (12) months prior to the claim, or "
+            "(b) ${liability_cap:,}. This limitation shall not apply to breaches "
+            "of confidentiality obligations or indemnification for third-party IP claims."
+        ),
+    ),
+    "indemnification": (
+        (
+            "Indemnification. {company_a} (the \"Indemnifying Party\") shall defend, indemnify, "
+            "and hold harmless {company_b} (the \"Indemnified Party\"), its officers, directors, "
+            "employees, and agents from and against any and all claims, damages, losses, "
+            "liabilities, costs, and expenses (including reasonable attorneys' fees) arising out "
+            "of or resulting from: (a) any breach of this Agreement by the Indemnifying Party; "
+            "(b) any third-party claim alleging that the Indemnifying Party's products or "
+            "services infringe any intellectual property right; or (c) the Indemnifying Party's "
+            "negligence or willful misconduct."
+        ),
+        (
+            "Mutual Indemnification. Each party agrees to indemnify, defend, and hold harmless "
+            "the other party from any third-party claims arising from: (i) a material breach of "
+            "representations or warranties; (ii) violation of applicable law; or (iii) gross "
+            "negligence or willful misconduct. The indemnified party must provide prompt written "
+            "notice and reasonable cooperation in the defense of any claim."
+        ),
+    ),
+    "termination": (
+        (
+            "Termination for Convenience. Either party may terminate this Agreement at any time, "
+            "for any reason or no reason, upon {convenience_notice_days} days' prior written "
+            "notice to the other party. Upon such termination, {company_b} shall pay {company_a} "
+            "for all services performed and expenses incurred through the effective date of "
+            "termination."
+        ),
+        (
+            "Termination for Cause. Either party may terminate this Agreement immediately upon "
+            "written notice if the other party: (a) materially breaches this Agreement and fails "
+            "to cure such breach within {cure_days} days after receiving written "
+            "notice thereof; (b) becomes insolvent or files for bankruptcy; or (c) ceases to "
+            "conduct business in the normal course."
+        ),
+    ),
+    "non_compete": (
+        (
+            "Non-Competition. During the term of this Agreement and for a period of "
+            "{non_compete_months} months following its termination, {company_b} agrees "
+            "not to directly or indirectly engage in, own, manage, operate, or participate in "
+            "any business that competes with {company_a}'s core business of "
+            "{business} within the geographic region of {state}."
+        ),
+        (
+            "Non-Solicitation. For a period of {non_solicit_months} months following "
+            "termination of this Agreement, neither party shall directly or indirectly solicit, "
+            "recruit, or hire any employee or contractor of the other party who was involved in "
+            "the performance of services under this Agreement."
+        ),
+    ),
+    "confidentiality": (
+        (
+            "Confidentiality. Each party acknowledges that in connection with this Agreement it "
+            "may receive Confidential Information of the other party. \"Confidential Information\" "
+            "means any information disclosed by one party to the other, whether orally, in "
+            "writing, or electronically, that is designated as confidential or that reasonably "
+            "should be understood to be confidential. The receiving party shall: (a) hold the "
+            "Confidential Information in strict confidence; (b) not disclose it to any third "
+            "party without prior written consent; and (c) use it solely for the purposes of "
+            "this Agreement. These obligations shall survive for {confidentiality_years} years "
+            "after termination."
+        ),
+    ),
+    "ip_ownership": (
+        (
+            "Intellectual Property Ownership. All Work Product created by {company_b} in "
+            "connection with the Services shall be considered \"work made for hire\" as defined "
+            "under the Copyright Act and shall be the sole and exclusive property of {company_a}. "
+            "To the extent any Work Product does not qualify as work made for hire, {company_b} "
+            "hereby irrevocably assigns to {company_a} all right, title, and interest in and to "
+            "such Work Product, including all intellectual property rights therein."
+        ),
+        (
+            "License Grant. {company_a} grants to {company_b} a non-exclusive, non-transferable, "
+            "revocable license to use the Software during the term of this Agreement solely for "
+            "{company_b}'s internal business purposes. {company_b} shall not sublicense, modify, "
+            "reverse engineer, or create derivative works based on the Software."
+        ),
+    ),
+    "governing_law": (
+        (
+            "Governing Law. This Agreement shall be governed by and construed in accordance with "
+            "the laws of the State of {state}, without regard to its conflict of laws principles. "
+            "Any legal action or proceeding arising under this Agreement shall be brought "
+            "exclusively in the federal or state courts located in {state}, and the parties "
+            "hereby consent to personal jurisdiction and venue therein."
+        ),
+    ),
+    "dispute_resolution": (
+        (
+            "Dispute Resolution. Any dispute, controversy, or claim arising out of or relating "
+            "to this Agreement shall first be submitted to mediation in accordance with the "
+            "mediation rules of the American Arbitration Association. If mediation fails to "
+            "resolve the dispute within {mediation_days} days, either party may "
+            "initiate binding arbitration under the Commercial Arbitration Rules of the AAA. "
+            "The arbitration shall take place in {city}, {state}."
+        ),
+    ),
+    "payment_terms": (
+        (
+            "Payment Terms. {company_b} shall pay {company_a} the fees set forth in the "
+            "applicable Statement of Work within {payment_terms} "
+            "days of receipt of a valid invoice. Late payments shall accrue interest at the rate "
+            "of {late_fee_pct}% per month or the maximum rate permitted by law, "
+            "whichever is less. All fees are exclusive of applicable taxes."
+        ),
+    ),
+    "auto_renewal": (
+        (
+            "Term and Renewal. This Agreement shall commence on the Effective Date and continue "
+            "for an initial term of {initial_term_years} year(s) (the \"Initial Term\"). "
+            "Thereafter, this Agreement shall automatically renew for successive "
+            "{renewal_years}-year periods (each a \"Renewal Term\") unless either party "
+            "provides written notice of non-renewal at least {renewal_notice_days} days "
+            "prior to the end of the then-current term."
+        ),
+    ),
+}
+
+# Random values for non-identity template placeholders.
+CLAUSE_FIELD_CHOICES: dict[str, tuple] = {
+    "liability_cap": tuple(range(50_000, 501_000, 1_000)),
+    "convenience_notice_days": (30, 60, 90),
+    "cure_days": (15, 30, 45),
+    "non_compete_months": (6, 12, 18, 24),
+    "non_solicit_months": (12, 18, 24),
+    "confidentiality_years": (2, 3, 5),
+    "mediation_days": (30, 45, 60),
+    "payment_terms": ("Net 30", "Net 45", "Net 60"),
+    "late_fee_pct": (1.0, 1.5, 2.0),
+    "initial_term_years": (1, 2, 3),
+    "renewal_years": (1, 2),
+    "renewal_notice_days": (30, 60, 90),
+}
+
+# Clause excerpts stored in the structured output are capped at this length.
+CLAUSE_TEXT_LIMIT = 300
+
+
+def _truncate(text: str, limit: int = CLAUSE_TEXT_LIMIT, suffix: str = "...") -> str:
+    """Cap *text* at *limit* characters, appending *suffix* only if it was cut."""
+    if len(text) <= limit:
+        return text
+    return text[:limit] + suffix
+
+
+class _ClauseFields(dict):
+    """``str.format_map`` mapping that draws missing placeholders from *rng*.
+
+    ``business`` and ``city`` come from the Faker pools; any other missing key
+    is drawn from ``CLAUSE_FIELD_CHOICES``.
+    """
+
+    def __init__(self, rng: random.Random, **fields: str) -> None:
+        super().__init__(fields)
+        self._rng = rng
+
+    def __missing__(self, key: str) -> object:
+        if key == "business":
+            value = self._rng.choice(BS_POOL)
+        elif key == "city":
+            value = self._rng.choice(CITY_POOL)
+        else:
+            value = self._rng.choice(CLAUSE_FIELD_CHOICES[key])
+        self[key] = value
+        return value
+
+
+# Not memoised: almost every call has a distinct (clause type, parties, state) key.
 def _generate_clause_text(
-    fake: Faker,
     rng: random.Random,
     clause_type: str,
     *,
     company_a: str = "",
     company_b: str = "",
     state: str = "",
+    company_a_upper: str = "",
+    company_b_upper: str = "",
 ) -> str:
     """Generate a realistic-looking contract clause paragraph.
 
@@ -222,155 +522,27 @@ def _generate_clause_text(
                    between document text and structured extraction.
         company_b: Party B name.
         state: Governing state for jurisdiction clauses.
+        company_a_upper: ``company_a.upper()``, if the caller already has it.
+        company_b_upper: ``company_b.upper()``, if the caller already has it.
     """
-    company_a = company_a or fake.company()
-    company_b = company_b or fake.company()
+    company_a = company_a or rng.choice(COMPANY_POOL)
+    company_b = company_b or rng.choice(COMPANY_POOL)
     state = state or rng.choice(US_STATES)
 
-    templates: dict[str, list[str]] = {
-        "limitation_of_liability": [
-            (
-                f"LIMITATION OF LIABILITY. IN NO EVENT SHALL {company_a.upper()} BE LIABLE TO "
-                f"{company_b.upper()} FOR ANY INDIRECT, INCIDENTAL, SPECIAL, CONSEQUENTIAL, OR "
-                f"PUNITIVE DAMAGES, REGARDLESS OF THE CAUSE OF ACTION OR THE THEORY OF LIABILITY, "
-                f"EVEN IF {company_a.upper()} HAS BEEN ADVISED OF THE POSSIBILITY OF SUCH DAMAGES. "
-                f"THE TOTAL AGGREGATE LIABILITY OF {company_a.upper()} UNDER THIS AGREEMENT SHALL "
-                f"NOT EXCEED THE TOTAL FEES PAID BY {company_b.upper()} DURING THE TWELVE (12) "
-                f"MONTH PERIOD PRECEDING THE EVENT GIVING RISE TO THE CLAIM."
-            ),
-            (
-                f"Liability Cap. The maximum aggregate liability of either party arising out of or "
-                f"related to this Agreement shall not exceed the greater of (a) the amounts paid or "
-                f"payable under this Agreement during the twelve (12) months prior to the claim, or "
-                f"(b) ${rng.randint(50, 500) * 1000:,}. This limitation shall not apply to breaches "
-                f"of confidentiality obligations or indemnification for third-party IP claims."
-            ),
-        ],
-        "indemnification": [
-            (
-                f"Indemnification. {company_a} (the \"Indemnifying Party\") shall defend, indemnify, "
-                f"and hold harmless {company_b} (the \"Indemnified Party\"), its officers, directors, "
-                f"employees, and agents from and against any and all claims, damages, losses, "
-                f"liabilities, costs, and expenses (including reasonable attorneys' fees) arising out "
-                f"of or resulting from: (a) any breach of this Agreement by the Indemnifying Party; "
-                f"(b) any third-party claim alleging that the Indemnifying Party's products or "
-                f"services infringe any intellectual property right; or (c) the Indemnifying Party's "
-                f"negligence or willful misconduct."
-            ),
-            (
-                f"Mutual Indemnification. Each party agrees to indemnify, defend, and hold harmless "
-                f"the other party from any third-party claims arising from: (i) a material breach of "
-                f"representations or warranties; (ii) violation of applicable law; or (iii) gross "
-                f"negligence or willful misconduct. The indemnified party must provide prompt written "
-                f"notice and reasonable cooperation in the defense of any claim."
-            ),
-        ],
-        "termination": [
-            (
-                f"Termination for Convenience. Either party may terminate this Agreement at any time, "
-                f"for any reason or no reason, upon {rng.choice([30, 60, 90])} days' prior written "
-                f"notice to the other party. Upon such termination, {company_b} shall pay {company_a} "
-                f"for all services performed and expenses incurred through the effective date of "
-                f"termination."
-            ),
-            (
-                f"Termination for Cause. Either party may terminate this Agreement immediately upon "
-                f"written notice if the other party: (a) materially breaches this Agreement and fails "
-                f"to cure such breach within {rng.choice([15, 30, 45])} days after receiving written "
-                f"notice thereof; (b) becomes insolvent or files for bankruptcy; or (c) ceases to "
-                f"conduct business in the normal course."
-            ),
-        ],
-        "non_compete": [
-            (
-                f"Non-Competition. During the term of this Agreement and for a period of "
-                f"{rng.choice([6, 12, 18, 24])} months following its termination, {company_b} agrees "
-                f"not to directly or indirectly engage in, own, manage, operate, or participate in "
-                f"any business that competes with {company_a}'s core business of {fake.bs()} within "
-                f"the geographic region of {state}."
-            ),
-            (
-                f"Non-Solicitation. For a period of {rng.choice([12, 18, 24])} months following "
-                f"termination of this Agreement, neither party shall directly or indirectly solicit, "
-                f"recruit, or hire any employee or contractor of the other party who was involved in "
-                f"the performance of services under this Agreement."
-            ),
-        ],
-        "confidentiality": [
-            (
-                f"Confidentiality. Each party acknowledges that in connection with this Agreement it "
-                f"may receive Confidential Information of the other party. \"Confidential Information\" "
-                f"means any information disclosed by one party to the other, whether orally, in "
-                f"writing, or electronically, that is designated as confidential or that reasonably "
-                f"should be understood to be confidential. The receiving party shall: (a) hold the "
-                f"Confidential Information in strict confidence; (b) not disclose it to any third "
-                f"party without prior written consent; and (c) use it solely for the purposes of "
-                f"this Agreement. These obligations shall survive for {rng.choice([2, 3, 5])} years "
-                f"after termination."
-            ),
-        ],
-        "ip_ownership": [
-            (
-                f"Intellectual Property Ownership. All Work Product created by {company_b} in "
-                f"connection with the Services shall be considered \"work made for hire\" as defined "
-                f"under the Copyright Act and shall be the sole and exclusive property of {company_a}. "
-                f"To the extent any Work Product does not qualify as work made for hire, {company_b} "
-                f"hereby irrevocably assigns to {company_a} all right, title, and interest in and to "
-                f"such Work Product, including all intellectual property rights therein."
-            ),
-            (
-                f"License Grant. {company_a} grants to {company_b} a non-exclusive, non-transferable, "
-                f"revocable license to use the Software during the term of this Agreement solely for "
-                f"{company_b}'s internal business purposes. {company_b} shall not sublicense, modify, "
-                f"reverse engineer, or create derivative works based on the Software."
-            ),
-        ],
-        "governing_law": [
-            (
-                f"Governing Law. This Agreement shall be governed by and construed in accordance with "
-                f"the laws of the State of {state}, without regard to its conflict of laws principles. "
-                f"Any legal action or proceeding arising under this Agreement shall be brought "
-                f"exclusively in the federal or state courts located in {state}, and the parties "
-                f"hereby consent to personal jurisdiction and venue therein."
-            ),
-        ],
-        "dispute_resolution": [
-            (
-                f"Dispute Resolution. Any dispute, controversy, or claim arising out of or relating "
-                f"to this Agreement shall first be submitted to mediation in accordance with the "
-                f"mediation rules of the American Arbitration Association. If mediation fails to "
-                f"resolve the dispute within {rng.choice([30, 45, 60])} days, either party may "
-                f"initiate binding arbitration under the Commercial Arbitration Rules of the AAA. "
-                f"The arbitration shall take place in {fake.city()}, {state}."
-            ),
-        ],
-        "payment_terms": [
-            (
-                f"Payment Terms. {company_b} shall pay {company_a} the fees set forth in the "
-                f"applicable Statement of Work within {rng.choice(['Net 30', 'Net 45', 'Net 60'])} "
-                f"days of receipt of a valid invoice. Late payments shall accrue interest at the rate "
-                f"of {rng.choice([1.0, 1.5, 2.0])}% per month or the maximum rate permitted by law, "
-                f"whichever is less. All fees are exclusive of applicable taxes."
-            ),
-        ],
-        "auto_renewal": [
-            (
-                f"Term and Renewal. This Agreement shall commence on the Effective Date and continue "
-                f"for an initial term of {rng.choice([1, 2, 3])} year(s) (the \"Initial Term\"). "
-                f"Thereafter, this Agreement shall automatically renew for successive "
-                f"{rng.choice([1, 2])}-year periods (each a \"Renewal Term\") unless either party "
-                f"provides written notice of non-renewal at least {rng.choice([30, 60, 90])} days "
-                f"prior to the end of the then-current term."
-            ),
-        ],
-    }
-
-    clause_templates = templates.get(clause_type, templates["confidentiality"])
-    return rng.choice(clause_templates)
+    clause_templates = CLAUSE_TEMPLATES.get(clause_type, CLAUSE_TEMPLATES["confidentiality"])
+    return rng.choice(clause_templates).format_map(
+        _ClauseFields(
+            rng,
+            company_a=company_a,
+            company_a_upper=company_a_upper or company_a.upper(),
+            company_b=company_b,
+            company_b_upper=company_b_upper or company_b.upper(),
+            state=state,
+        )
+    )
 
 
 def _generate_contract_text(
-    fake: Faker,
     rng: random.Random,
     contract_type: str,
     clauses: list[dict],
@@ -387,11 +559,11 @@ def _generate_contract_text(
     header = (
         f"{contract_type} AGREEMENT\n\n"
         f"This {contract_type} Agreement (this \"Agreement\") is entered into as of {effective_date} "
-        f"(the \"Effective Date\") by and between {company_a}, a {fake.state()} "
-        f"corporation (\"{company_a}\" or \"Party A\"), and {company_b}, a {fake.state()} "
+        f"(the \"Effective Date\") by and between {company_a}, a {rng.choice(US_STATES)} "
+        f"corporation (\"{company_a}\" or \"Party A\"), and {company_b}, a {rng.choice(US_STATES)} "
         f"corporation (\"{company_b}\" or \"Party B\").\n\n"
         f"WHEREAS, {company_a} desires to engage {company_b} to provide certain services "
-        f"related to {fake.bs()}; and\n\n"
+        f"related to {rng.choice(BS_POOL)}; and\n\n"
         f"WHEREAS, {company_b} desires to provide such services subject to the terms and "
         f"conditions set forth herein;\n\n"
         f"NOW, THEREFORE, in consideration of the mutual covenants and agreements hereinafter "
@@ -399,26 +571,38 @@ def _generate_contract_text(
         f"of which are hereby acknowledged, the parties agree as follows:\n\n"
     )
 
-    body_parts = []
-    for i, clause in enumerate(clauses, start=1):
-        body_parts.append(f"Section {i}. {clause['text']}\n")
-
-    return header + "\n".join(body_parts)
+    return header + "\n".join(
+        [f"Section {i}. {clause['text']}\n" for i, clause in enumerate(clauses, start=1)]
+    )
 
 
 def generate_synthetic_contract(
     fake: Faker,
     rng: random.Random,
+    *,
+    contract_type: str | None = None,
+    num_clauses: int | None = None,
+    company_a: str | None = None,
+    company_b: str | None = None,
+    state: str | None = None,
 ) -> dict:
-    """Generate one synthetic contract training example."""
-    contract_type = rng.choice(CONTRACT_TYPES)
-    num_clauses = rng.randint(2, 5)
+    """Generate one synthetic contract training example.
+
+    The keyword arguments let a caller supply contract-level draws it made in
+    bulk (see :func:`generate_synthetic_chunk`); any left as None are drawn
+    from *rng* here.
+    """
+    contract_type = contract_type or rng.choice(CONTRACT_TYPES)
+    num_clauses = num_clauses or rng.randint(2, 5)
     selected_clause_types = rng.sample(CLAUSE_TYPES, min(num_clauses, len(CLAUSE_TYPES)))
 
     # Generate identity data ONCE — used consistently across document text and extraction
-    company_a = fake.company()
-    company_b = fake.company()
-    state = rng.choice(US_STATES)
+    company_a = company_a or rng.choice(COMPANY_POOL)
+    company_b = company_b or rng.choice(COMPANY_POOL)
+    state = state or rng.choice(US_STATES)
+    # Upper-cased once per contract; several clause templates shout the names.
+    company_a_upper = company_a.upper()
+    company_b_upper = company_b.upper()
     effective_date = fake.date_between(start_date="-5y", end_date="today").isoformat()
     expiration_date = fake.date_between(start_date="+1y", end_date="+5y").isoformat()
 
@@ -427,8 +611,9 @@ def generate_synthetic_contract(
     for clause_type in selected_clause_types:
         # Pass the SAME company names and state to ensure clause text matches extraction
         text = _generate_clause_text(
-            fake, rng, clause_type,
+            rng, clause_type,
             company_a=company_a, company_b=company_b, state=state,
+            company_a_upper=company_a_upper, company_b_upper=company_b_upper,
         )
         risk_level = CLAUSE_RISK_MAP[clause_type]
         # Sometimes vary the risk level
@@ -439,7 +624,7 @@ def generate_synthetic_contract(
 
         clauses.append({
             "clause_type": clause_type,
-            "text": text[:300] + "..." if len(text) > 300 else text,
+            "text": _truncate(text),
             "page": rng.randint(1, 15),
             "risk_level": risk_level,
             "risk_reason": risk_reason,
@@ -461,27 +646,27 @@ def generate_synthetic_contract(
 
     # Build the document text — pass same identity to ensure consistency
     contract_text = _generate_contract_text(
-        fake, rng, contract_type, clauses,
+        rng, contract_type, clauses,
         company_a=company_a, company_b=company_b, effective_date=effective_date,
     )
 
     # Build structured output
-    structured_output = {
-        "document_type": contract_type,
-        "parties": [
+    structured_output = StructuredOutput(
+        document_type=contract_type,
+        parties=[
             {"name": company_a, "role": "party_a"},
             {"name": company_b, "role": "party_b"},
         ],
-        "effective_date": effective_date,
-        "expiration_date": expiration_date,
-        "key_clauses": clauses,
-        "obligations": obligations,
-        "summary": (
+        effective_date=effective_date,
+        expiration_date=expiration_date,
+        key_clauses=clauses,
+        obligations=obligations,
+        summary=(
             f"This {contract_type} agreement between {company_a} and {company_b}, effective "
             f"{effective_date}, covers {', '.join(ct.replace('_', ' ') for ct in selected_clause_types)}. "
             f"The agreement expires on {expiration_date}."
         ),
-    }
+    )
 
     user_message = (
         f"Analyze this contract and extract key information:\n\n"
@@ -491,90 +676,162 @@ def generate_synthetic_contract(
         f"obligations, and summary."
     )
 
-    assistant_response = json.dumps(structured_output, indent=2, ensure_ascii=False)
+    assistant_response = dump_structured_output(structured_output)
 
     return make_conversation(SYSTEM_PROMPT, user_message, assistant_response)
 
 
 # ---------------------------------------------------------------------------
-# CUAD dataset processing (for network-enabled environments)
+# Parallel synthetic generation
 # ---------------------------------------------------------------------------
 
+# Examples per pool task.  Every task carries its own seed, so the generated
+# dataset depends only on --seed, never on the number of worker processes.
+SYNTHETIC_CHUNK_SIZE = 100
 
-def load_cuad_dataset(max_examples: int) -> list[dict]:
-    """Load and transform CUAD dataset from HuggingFace.
+MAX_EXAMPLE_TOKENS = 4096
+
+# Possible clause counts per contract (same range as ``rng.randint(2, 5)``).
+CLAUSE_COUNTS = (2, 3, 4, 5)
+
+_worker_fake: Faker | None = None
+
+
+def _init_worker(seed: int, pool_size: int = FAKER_POOL_SIZE) -> None:
+    """Build the process's Faker and its value pools.
+
+    Runs once in the parent (inherited by forked workers) and as the pool
+    initializer for spawned workers.  Pools are always seeded from the
+    same *seed*, so every process samples from identical pools.
+    """
+    from faker import Faker
 
-    Requires network access and the ``datasets`` library.
+    global _worker_fake
+    _worker_fake = Faker()
+    build_faker_pools(seed, pool_size)
+
+
+def generate_synthetic_chunk(task: tuple[int, int, str]) -> int:
+    """Generate a chunk of synthetic examples into a JSONL shard (pool worker entrypoint).
+
+    Examples are written straight to the shard rather than returned, so only
+    an ``int`` crosses the process boundary instead of a pickled list.
 
     Args:
-        max_examples: Maximum number of examples to produce.
+        task: ``(seed, n, shard_path)`` — the chunk's seed, how many examples
+            to attempt, and the JSONL file to write them to.
 
     Returns:
-        List of conversation dicts in ShareGPT format.
+        The number of examples written (those over ``MAX_EXAMPLE_TOKENS`` are
+        dropped).
     """
-    try:
-        from datasets import load_dataset
-    except ImportError:
-        logger.error("datasets library not available. Use --synthetic-only.")
-        return []
+    seed, n, shard_path = task
+    fake = _worker_fake
+    fake.seed_instance(seed)
+    rng = random.Random(seed)
+
+    # Draw the contract-level fields for the whole chunk up front: one
+    # ``choices(k=n)`` call per field instead of n ``choice`` calls.
+    contract_types = rng.choices(CONTRACT_TYPES, k=n)
+    clause_counts = rng.choices(CLAUSE_COUNTS, k=n)
+    companies_a = rng.choices(COMPANY_POOL, k=n)
+    companies_b = rng.choices(COMPANY_POOL, k=n)
+    states = rng.choices(US_STATES, k=n)
+
+    written = 0
+    with open(shard_path, "w", encoding="utf-8") as out:
+        for i in range(n):
+            example = generate_synthetic_contract(
+                fake, rng,
+                contract_type=contract_types[i],
+                num_clauses=clause_counts[i],
+                company_a=companies_a[i],
+                company_b=companies_b[i],
+                state=states[i],
+            )
+
+            # Filter out examples that are too long (> 4096 estimated tokens)
+            if estimate_conversation_tokens(example) > MAX_EXAMPLE_TOKENS:
+                continue
+
+            out.write(json.dumps(example, ensure_ascii=False))
+            out.write("\n")
+            written += 1
+    return written
 
-    logger.info("Loading CUAD dataset from HuggingFace...")
-    try:
-        cuad = load_dataset("theatticusproject/cuad-qa", split="train")
-    except Exception as e:
-        logger.error("Failed to load CUAD dataset: %s", e)
-        return []
 
-    examples: list[dict] = []
-    seen_contexts: set[str] = set()
+# ---------------------------------------------------------------------------
+# CUAD dataset processing (for network-enabled environments)
+# ---------------------------------------------------------------------------
+
 
-    for row in cuad:
-        if len(examples) >= max_examples:
-            break
+def _context_fingerprint(context: str) -> int:
+    """Return a 64-bit fingerprint of the first 200 characters of *context*.
 
-        context = row.get("context", "")
-        question = row.get("question", "")
-        answers = row.get("answers", {})
+    Used as the CUAD dedupe key: an ``int`` costs a fraction of the memory of
+    the 200-character prefix it replaces.  BLAKE2b (rather than ``hash()``)
+    keeps fingerprints stable across processes.  Signed, so it fits an Arrow
+    ``int64`` column.
+    """
+    digest = hashlib.blake2b(context[:200].encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
 
-        # Skip empty or duplicate contexts
-        context_key = context[:200]
-        if not context or context_key in seen_contexts:
-            continue
-        seen_contexts.add(context_key)
 
+# Rows per ``Dataset.map`` batch in the CUAD pipeline.
+CUAD_MAP_BATCH_SIZE = 1024
+
+
+def _cuad_fingerprint_batch(batch: dict[str, list]) -> dict[str, list]:
+    """``Dataset.map`` function: fingerprint each context (None if empty)."""
+    return {
+        "fingerprint": [
+            _context_fingerprint(context) if context else None
+            for context in batch["context"]
+        ]
+    }
+
+
+def _cuad_transform_batch(batch: dict[str, list], indices: list[int]) -> dict[str, list]:
+    """``Dataset.map`` function: turn CUAD rows into serialized conversations.
+
+    Each row's risk reason is picked by ``derive_task_seed(0, index)`` rather
+    than a per-row ``random.Random``, so the result does not depend on how rows
+    are split across processes and no Mersenne Twister is seeded per row.
+    """
+    conversations = []
+    for index, context, question, answers in zip(
+        indices, batch["context"], batch["question"], batch["answers"]
+    ):
         # Determine clause type from the question
-        clause_type = None
-        for cuad_cat, our_type in CUAD_CATEGORY_MAP.items():
-            if cuad_cat.lower() in question.lower():
-                clause_type = our_type
-                break
+        clause_type = cuad_question_to_clause_type(question or "")
 
         if clause_type is None:
             clause_type = "confidentiality"  # default fallback
 
-        answer_texts = answers.get("text", [])
+        answer_texts = (answers or {}).get("text", [])
         answer_text = answer_texts[0] if answer_texts else ""
 
         risk_level = CLAUSE_RISK_MAP.get(clause_type, "medium")
-        risk_reason = random.choice(RISK_REASONS.get(clause_type, RISK_REASONS["confidentiality"]))
-
-        structured_output = {
-            "document_type": "Other",
-            "parties": [],
-            "effective_date": "",
-            "expiration_date": "",
-            "key_clauses": [
+        reasons = RISK_REASONS.get(clause_type, RISK_REASONS["confidentiality"])
+        risk_reason = reasons[derive_task_seed(0, index) % len(reasons)]
+
+        structured_output = StructuredOutput(
+            document_type="Other",
+            parties=[],
+            effective_date="",
+            expiration_date="",
+            key_clauses=[
                 {
                     "clause_type": clause_type,
-                    "text": answer_text[:300] if answer_text else context[:300],
+                    "text": _truncate(answer_text or context, suffix=""),
                     "page": 0,
                     "risk_level": risk_level,
                     "risk_reason": risk_reason,
                 }
             ],
-            "obligations": [],
-            "summary": f"Contract clause related to {clause_type.replace('_', ' ')}.",
-        }
+            obligations=[],
+            summary=f"Contract clause related to {clause_type.replace('_', ' ')}.",
+        )
 
         user_message = (
             f"Analyze this contract clause and extract key information:\n\n"
@@ -584,8 +841,62 @@ def load_cuad_dataset(max_examples: int) -> list[dict]:
             f"obligations, and summary."
         )
 
-        assistant_response = json.dumps(structured_output, indent=2, ensure_ascii=False)
-        examples.append(make_conversation(SYSTEM_PROMPT, user_message, assistant_response))
+        assistant_response = dump_structured_output(structured_output)
+        conversation = make_conversation(SYSTEM_PROMPT, user_message, assistant_response)
+        conversations.append(json.dumps(conversation, ensure_ascii=False))
+    return {"conversation": conversations}
+
+
+def load_cuad_dataset(max_examples: int, num_proc: int = 1) -> list[dict]:
+    """Load and transform CUAD dataset from HuggingFace.
+
+    Requires network access and the ``datasets`` library.  Fingerprinting and
+    the row transform run as batched ``Dataset.map`` calls across *num_proc*
+    processes; only the order-dependent dedupe runs in this process.
+
+    Args:
+        max_examples: Maximum number of examples to produce.
+        num_proc: Processes for ``Dataset.map``.
+
+    Returns:
+        List of conversation dicts in ShareGPT format.
+    """
+    try:
+        from datasets import load_dataset
+    except ImportError:
+        logger.error("datasets library not available. Use --synthetic-only.")
+        return []
+
+    logger.info("Loading CUAD dataset from HuggingFace...")
+    try:
+        cuad = load_dataset("theatticusproject/cuad-qa", split="train")
+    except Exception as e:
+        logger.error("Failed to load CUAD dataset: %s", e)
+        return []
+
+    map_kwargs = {
+        "batched": True,
+        "batch_size": CUAD_MAP_BATCH_SIZE,
+        "num_proc": num_proc if num_proc > 1 else None,
+        "remove_columns": cuad.column_names,
+    }
+
+    fingerprints = cuad.map(_cuad_fingerprint_batch, **map_kwargs)["fingerprint"]
+
+    # Keep the first row of each distinct, non-empty context, in dataset order
+    keep: list[int] = []
+    seen_fingerprints: set[int] = set()
+    for index, fingerprint in enumerate(fingerprints):
+        if len(keep) >= max_examples:
+            break
+        if fingerprint is None or fingerprint in seen_fingerprints:
+            continue
+        seen_fingerprints.add(fingerprint)
+        keep.append(index)
+    del fingerprints, seen_fingerprints
+
+    converted = cuad.select(keep).map(_cuad_transform_batch, with_indices=True, **map_kwargs)
+    examples = [json.loads(conversation) for conversation in converted["conversation"]]
 
     logger.info("Loaded %d examples from CUAD.", len(examples))
     return examples
@@ -596,6 +907,91 @@ def load_cuad_dataset(max_examples: int) -> list[dict]:
 # ---------------------------------------------------------------------------
 
 
+def _write_examples(
+    out: TextIO,
+    tmp_dir: str,
+    target: int,
+    rng: random.Random,
+    use_cuad: bool,
+    workers: int,
+    seed: int,
+) -> int:
+    """Write CUAD and synthetic examples to *out* as JSON Lines.
+
+    Synthetic shards are staged in *tmp_dir*.  Returns the number of examples
+    written.
+    """
+    total = 0
+
+    # Step 1: Try loading CUAD (unless synthetic-only)
+    if use_cuad:
+        cuad_target = int(target * 0.6)  # 60% from CUAD
+        cuad_examples = load_cuad_dataset(cuad_target, num_proc=workers)
+        for example in cuad_examples:
+            out.write(json.dumps(example, ensure_ascii=False))
+            out.write("\n")
+        total += len(cuad_examples)
+        logger.info("CUAD examples collected: %d", len(cuad_examples))
+        del cuad_examples
+
+    # Step 2: Fill remaining with synthetic data
+    remaining = target - total
+    logger.info("Generating %d synthetic contract examples...", remaining)
+
+    # Each task writes its own shard; the parent appends shards to all.jsonl
+    # in task order as they complete, so the output stays deterministic.
+    tasks = [
+        (
+            rng.getrandbits(32),
+            min(SYNTHETIC_CHUNK_SIZE, remaining - start),
+            os.path.join(tmp_dir, f"synthetic_{start // SYNTHETIC_CHUNK_SIZE:06d}.jsonl"),
+        )
+        for start in range(0, remaining, SYNTHETIC_CHUNK_SIZE)
+    ]
+    workers = max(1, min(workers, len(tasks)))
+    # No point generating more pool values than the run can draw.
+    pool_size = min(FAKER_POOL_SIZE, max(remaining, 1))
+
+    if workers == 1:
+        _init_worker(seed, pool_size)
+        chunks = map(generate_synthetic_chunk, tasks)
+        pool = None
+    elif not use_cuad and "fork" in multiprocessing.get_all_start_methods():
+        # Build Faker and its pools once in the parent; forked workers inherit
+        # them copy-on-write.
+        _init_worker(seed, pool_size)
+        pool = multiprocessing.get_context("fork").Pool(processes=workers)
+        chunks = pool.imap(generate_synthetic_chunk, tasks)
+    else:
+        # Loading CUAD starts datasets/pyarrow threads, and forking a threaded
+        # process is unsafe, so workers are spawned and build their own pools.
+        pool = multiprocessing.get_context("spawn").Pool(
+            processes=workers,
+            initializer=_init_worker,
+            initargs=(seed, pool_size),
+        )
+        chunks = pool.imap(generate_synthetic_chunk, tasks)
+
+    try:
+        attempted = 0
+        for (_, n, shard_path), written in zip(tasks, chunks):
+            out.flush()
+            with open(shard_path, "rb") as shard:
+                shutil.copyfileobj(shard, out.buffer)
+            os.remove(shard_path)
+            total += written
+            attempted += n
+            if attempted % 500 == 0:
+                logger.info("  Generated %d / %d synthetic examples", attempted, remaining)
+    finally:
+        if pool is not None:
+            # Every result is consumed on success; on error, drop queued tasks.
+            pool.terminate()
+            pool.join()
+
+    return total
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Prepare contract analysis training dataset"
@@ -616,57 +1012,50 @@ def main() -> None:
         default=6000,
         help="Target number of total examples (default: 6000).",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes for CUAD processing and synthetic generation (default: CPU count).",
+    )
     add_seed_argument(parser)
     args = parser.parse_args()
 
     rng = random.Random(args.seed)
-    fake = Faker()
-    Faker.seed(args.seed)
 
     target = 100 if args.dry_run else args.num_examples
     output_dir = DATASETS_DIR / "contracts"
 
     logger.info("Target examples: %d (dry_run=%s, synthetic_only=%s)", target, args.dry_run, args.synthetic_only)
 
-    examples: list[dict] = []
-
-    # Step 1: Try loading CUAD (unless synthetic-only)
-    if not args.synthetic_only and not args.dry_run:
-        cuad_target = int(target * 0.6)  # 60% from CUAD
-        cuad_examples = load_cuad_dataset(cuad_target)
-        examples.extend(cuad_examples)
-        logger.info("CUAD examples collected: %d", len(cuad_examples))
-
-    # Step 2: Fill remaining with synthetic data
-    remaining = target - len(examples)
-    logger.info("Generating %d synthetic contract examples...", remaining)
-
-    for i in range(remaining):
-        example = generate_synthetic_contract(fake, rng)
-
-        # Filter out examples that are too long (> 4096 estimated tokens)
-        total_text = "".join(
-            turn["content"] for turn in example["messages"]
-        )
-        if estimate_tokens(total_text) > 4096:
-            continue
-
-        examples.append(example)
-
-        if (i + 1) % 500 == 0:
-            logger.info("  Generated %d / %d synthetic examples", i + 1, remaining)
-
-    logger.info("Total examples: %d", len(examples))
-
-    # Step 3: Save with train/val/test split
-    counts = save_dataset(examples, output_dir, seed=args.seed)
+    # Examples are streamed to a JSONL file as they are produced, so memory
+    # stays bounded by one example rather than the whole dataset.
+    with tempfile.TemporaryDirectory(prefix="prepare_contracts_") as tmp_dir:
+        all_path = Path(tmp_dir) / "all.jsonl"
+        with open(all_path, "w", encoding="utf-8") as out:
+            total = _write_examples(
+                out,
+                tmp_dir,
+                target,
+                rng,
+                use_cuad=not args.synthetic_only and not args.dry_run,
+                workers=args.workers,
+                seed=args.seed,
+            )
+        logger.info("Total examples: %d", total)
+
+        with open(all_path, "r", encoding="utf-8") as f:
+            first_line = f.readline()
+
+        # Step 3: Save with train/val/test split
+        counts = save_dataset_from_jsonl([all_path], output_dir, seed=args.seed)
     logger.info("Saved dataset to %s", output_dir)
     logger.info("  train: %d | validation: %d | test: %d", counts["train"], counts["validation"], counts["test"])
 
     # Step 4: Print a sample
-    if examples:
+    if first_line:
         logger.info("Sample example (first):")
-        sample = examples[0]
+        sample = json.loads(first_line)
         for turn in sample["messages"]:
             logger.info("  [%s] %s", turn["role"], turn["content"][:120] + "...")
 
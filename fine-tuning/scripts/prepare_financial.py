@@ -16,10 +16,10 @@ Usage:
 from __future__ import annotations
 
 import argparse
-import json
+import os
 import random
-import string
 import sys
+import tempfile
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
@@ -27,9 +27,13 @@ sys.path.insert(0, str(Path(__file__).resolve().parent))
 from shared import (
     DATASETS_DIR,
     add_seed_argument,
-    estimate_tokens,
+    dump_json_indented,
+    dump_json_line,
+    estimate_tokens_parts,
+    generate_sharded,
     make_conversation,
-    save_dataset,
+    sample_distinct,
+    save_dataset_from_jsonl,
     setup_logging,
 )
 
@@ -51,12 +55,12 @@ SYSTEM_PROMPT = (
 # Data pools for synthetic generation
 # ---------------------------------------------------------------------------
 
-CURRENCIES = [
+CURRENCIES = (
     ("USD", "$"), ("EUR", "€"), ("GBP", "£"), ("CAD", "C$"),
     ("AUD", "A$"), ("JPY", "¥"), ("CHF", "CHF "),
-]
+)
 
-COMPANY_NAMES = [
+COMPANY_NAMES = (
     "Acme Corporation", "GlobalTech Solutions", "Pinnacle Industries",
     "Stellar Dynamics", "Horizon Enterprises", "Quantum Systems Inc.",
     "Atlas Manufacturing", "Vertex Digital", "Cascade Technologies",
@@ -67,9 +71,9 @@ COMPANY_NAMES = [
     "Crescent Real Estate", "Phoenix Aerospace", "Diamond IT Solutions",
     "Cobalt Mining International", "Emerald Pharmaceuticals", "Obsidian Security",
     "Amber Technologies", "Jade Consulting Partners", "Onyx Manufacturing Co.",
-]
+)
 
-INVOICE_ITEMS = [
+INVOICE_ITEMS = (
     ("Professional consulting services", (100, 500)),
     ("Software development - Phase 1", (2000, 15000)),
     ("Cloud hosting - monthly", (50, 2000)),
@@ -90,15 +94,15 @@ INVOICE_ITEMS = [
     ("Freight and shipping", (100, 5000)),
     ("Equipment maintenance", (200, 2000)),
     ("Quality assurance testing", (500, 5000)),
-]
+)
 
-PAYMENT_TERMS_OPTIONS = [
+PAYMENT_TERMS_OPTIONS = (
     "Net 30", "Net 60", "Net 90", "Net 15",
     "Due on receipt", "2/10 Net 30", "Net 45",
     "50% upfront, 50% on completion",
-]
+)
 
-BANK_TRANSACTION_TYPES = [
+BANK_TRANSACTION_TYPES = (
     ("Direct deposit - Payroll", (2000, 8000)),
     ("Wire transfer - Vendor payment", (500, 50000)),
     ("ACH debit - Utility payment", (50, 500)),
@@ -114,32 +118,105 @@ BANK_TRANSACTION_TYPES = [
     ("Refund received", (20, 1000)),
     ("Interest earned", (1, 100)),
     ("Service charge", (5, 50)),
-]
+)
 
 FINANCIAL_STATEMENT_ITEMS = {
-    "revenue": [
+    "revenue": (
         ("Product revenue", (1000000, 50000000)),
         ("Service revenue", (500000, 20000000)),
         ("Subscription revenue", (200000, 10000000)),
         ("Licensing revenue", (100000, 5000000)),
-    ],
-    "expenses": [
+    ),
+    "expenses": (
         ("Cost of goods sold", (500000, 30000000)),
         ("Research and development", (200000, 10000000)),
         ("Sales and marketing", (100000, 8000000)),
         ("General and administrative", (100000, 5000000)),
         ("Depreciation and amortization", (50000, 3000000)),
-    ],
+    ),
 }
 
-TAX_FORM_TYPES = [
+TAX_FORM_TYPES = (
     "W-2", "1099-NEC", "1099-INT", "1099-DIV", "1099-MISC",
-]
+)
 
-STREET_NAMES = [
+STREET_NAMES = (
     "Main St", "Oak Ave", "Park Blvd", "Commerce Dr", "Industrial Way",
     "Tech Lane", "Market St", "Broadway", "First Ave", "Elm St",
-]
+)
+
+CITIES = (
+    "New York, NY", "Los Angeles, CA", "Chicago, IL", "Houston, TX",
+    "Phoenix, AZ", "San Francisco, CA", "Seattle, WA", "Denver, CO",
+    "Boston, MA", "Atlanta, GA", "Austin, TX", "Portland, OR",
+)
+
+MONTH_NAMES = (
+    "", "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+)
+
+BANK_NAMES = (
+    "First National Bank", "Citizens Federal Bank", "Pacific Coast Credit Union",
+    "Heritage Savings Bank", "Metro Commercial Bank", "Cornerstone Financial",
+)
+
+# Transaction descriptions that are credits (money in); everything else is a debit.
+CREDIT_TRANSACTIONS = frozenset(
+    desc for desc, _ in BANK_TRANSACTION_TYPES
+    if "deposit" in desc.lower() or "refund" in desc.lower() or "earned" in desc.lower()
+)
+
+# Bank statements and receipts only use USD/EUR/GBP.
+STATEMENT_CURRENCIES = CURRENCIES[:3]
+
+RECEIPT_ITEMS = (
+    ("Office paper, A4 ream", (5, 15)),
+    ("Printer ink cartridge", (20, 80)),
+    ("USB flash drive 32GB", (8, 25)),
+    ("Wireless mouse", (15, 50)),
+    ("Desk lamp", (20, 80)),
+    ("Notebook, ruled", (3, 12)),
+    ("Pens, pack of 10", (5, 15)),
+    ("Stapler", (8, 25)),
+    ("Whiteboard markers", (5, 20)),
+    ("Coffee beans, 1kg", (10, 30)),
+    ("Bottled water, case", (5, 15)),
+    ("Cleaning supplies", (10, 40)),
+    ("First aid kit", (15, 50)),
+    ("Extension cord", (10, 30)),
+    ("Cable organizer", (5, 20)),
+)
+
+INVOICE_TAX_RATES = (0.0, 0.05, 0.06, 0.07, 0.08, 0.0825, 0.10, 0.13, 0.20)
+RECEIPT_TAX_RATES = (0.0, 0.05, 0.06, 0.07, 0.08, 0.10)
+
+TAX_YEARS = (2022, 2023, 2024)
+
+# "00".."31": date fields are indexed out of this table instead of being
+# formatted with ``:02d`` on every call.
+ZERO_PADDED = tuple(f"{i:02d}" for i in range(32))
+
+# Value ranges drawn with ``rng.choices`` (one call per document, not per item).
+# Months and days are drawn already zero-padded.
+MONTHS = ZERO_PADDED[1:13]
+DAYS = ZERO_PADDED[1:29]
+INVOICE_QUANTITIES = tuple(range(1, 21))
+RECEIPT_QUANTITIES = tuple(range(1, 6))
+
+# Fixed-width labels and padding whose operands are constants, formatted once
+# here instead of re-applying the format spec on every generated document.
+INVOICE_TOTALS_PAD = f"{'':>50}"
+STATEMENT_RULE = f"{'':>45} {'─'*17}"
+STATEMENT_DOUBLE_RULE = f"{'':>45} {'═'*17}"
+STATEMENT_LABELS = {
+    label: f"{label:<45}"
+    for label in ("Total Revenue", "Total Expenses", "Operating Income", "Income Tax", "NET INCOME")
+}
+RECEIPT_LABELS = {label: f"{label:>35}" for label in ("Subtotal:", "Tax:", "TOTAL:")}
+
+FIRST_NAMES = ("John", "Jane", "Robert", "Maria", "David", "Sarah", "Michael", "Lisa")
+LAST_NAMES = ("Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis")
 
 
 # ---------------------------------------------------------------------------
@@ -150,30 +227,32 @@ STREET_NAMES = [
 def _random_address(rng: random.Random) -> str:
     num = rng.randint(100, 9999)
     street = rng.choice(STREET_NAMES)
-    cities = ["New York, NY", "Los Angeles, CA", "Chicago, IL", "Houston, TX",
-              "Phoenix, AZ", "San Francisco, CA", "Seattle, WA", "Denver, CO",
-              "Boston, MA", "Atlanta, GA", "Austin, TX", "Portland, OR"]
-    city = rng.choice(cities)
+    city = rng.choice(CITIES)
     zipcode = rng.randint(10000, 99999)
     return f"{num} {street}, {city} {zipcode}"
 
 
 def _random_account_number(rng: random.Random) -> str:
     """Generate a masked account number."""
-    last4 = "".join(rng.choices(string.digits, k=4))
-    return f"****{last4}"
+    return f"****{rng.randrange(10000):04d}"
 
 
 def _random_tax_id(rng: random.Random) -> str:
     """Generate a masked tax ID."""
-    last4 = "".join(rng.choices(string.digits, k=4))
-    return f"**-***{last4}"
+    return f"**-***{rng.randrange(10000):04d}"
 
 
 def _random_date(rng: random.Random, year: int = 2024) -> str:
     month = rng.randint(1, 12)
     day = rng.randint(1, 28)
-    return f"{year}-{month:02d}-{day:02d}"
+    return f"{year}-{ZERO_PADDED[month]}-{ZERO_PADDED[day]}"
+
+
+def _random_dates(rng: random.Random, n: int, year: int = 2024) -> list[str]:
+    """Draw *n* dates at once — two ``choices`` calls instead of 2n ``randint``."""
+    months = rng.choices(MONTHS, k=n)
+    days = rng.choices(DAYS, k=n)
+    return [f"{year}-{month}-{day}" for month, day in zip(months, days)]
 
 
 # ---------------------------------------------------------------------------
@@ -182,8 +261,14 @@ def _random_date(rng: random.Random, year: int = 2024) -> str:
 
 
 def _generate_invoice(rng: random.Random) -> tuple[str, dict]:
-    issuer = rng.choice(COMPANY_NAMES)
-    recipient = rng.choice([c for c in COMPANY_NAMES if c != issuer])
+    # Draw two distinct companies by index: the recipient index skips over the
+    # issuer's, so no filtered copy of COMPANY_NAMES is built per invoice.
+    n_companies = len(COMPANY_NAMES)
+    i = rng.randrange(n_companies)
+    j = rng.randrange(n_companies - 1)
+    if j >= i:
+        j += 1
+    issuer, recipient = COMPANY_NAMES[i], COMPANY_NAMES[j]
     currency_code, symbol = rng.choice(CURRENCIES)
     date = _random_date(rng)
     inv_num = f"INV-{rng.randint(1000, 99999)}"
@@ -191,37 +276,47 @@ def _generate_invoice(rng: random.Random) -> tuple[str, dict]:
 
     # Generate line items
     n_items = rng.randint(2, 8)
-    chosen_items = rng.sample(INVOICE_ITEMS, min(n_items, len(INVOICE_ITEMS)))
+    chosen_items = sample_distinct(rng, INVOICE_ITEMS, min(n_items, len(INVOICE_ITEMS)))
 
+    quantities = rng.choices(INVOICE_QUANTITIES, k=len(chosen_items))
+
+    # Each row's text line is formatted from the loop locals as the item is
+    # built, rather than in a second pass over the item dicts.
     line_items = []
-    for desc, (lo, hi) in chosen_items:
-        qty = rng.randint(1, 20)
+    item_rows = []
+    subtotal = 0
+    for i, ((desc, (lo, hi)), qty) in enumerate(zip(chosen_items, quantities), start=1):
         unit_price = round(rng.uniform(lo, hi), 2)
         total = round(qty * unit_price, 2)
+        subtotal += total
         line_items.append({
             "description": desc,
             "quantity": qty,
             "unit_price": unit_price,
             "total": total,
         })
+        item_rows.append(
+            f"  {i}. {desc:<45} {qty:>4} x {symbol}{unit_price:>10,.2f} = {symbol}{total:>12,.2f}"
+        )
 
-    subtotal = round(sum(item["total"] for item in line_items), 2)
-    tax_rate = rng.choice([0.0, 0.05, 0.06, 0.07, 0.08, 0.0825, 0.10, 0.13, 0.20])
+    subtotal = round(subtotal, 2)
+    tax_rate = rng.choice(INVOICE_TAX_RATES)
     tax = round(subtotal * tax_rate, 2)
     total = round(subtotal + tax, 2)
 
+    # Amounts that appear in both the text and the summary are formatted once;
+    # the text only pads the string to its column width.
+    tax_str = f"{tax:,.2f}"
+    total_str = f"{total:,.2f}"
+
     # Due date
-    due_offsets = {"Net 30": 30, "Net 60": 60, "Net 90": 90, "Net 15": 15, "Net 45": 45}
     due_date = _random_date(rng)  # simplified
 
     acct = _random_account_number(rng)
     tax_id = _random_tax_id(rng)
 
     # Build text
-    item_lines = "\n".join(
-        f"  {i+1}. {item['description']:<45} {item['quantity']:>4} x {symbol}{item['unit_price']:>10,.2f} = {symbol}{item['total']:>12,.2f}"
-        for i, item in enumerate(line_items)
-    )
+    item_lines = "\n".join(item_rows)
 
     text = (
         f"INVOICE\n"
@@ -232,9 +327,9 @@ def _generate_invoice(rng: random.Random) -> tuple[str, dict]:
         f"FROM:\n  {issuer}\n  {_random_address(rng)}\n  Tax ID: {tax_id}\n\n"
         f"BILL TO:\n  {recipient}\n  {_random_address(rng)}\n\n"
         f"ITEMS:\n{item_lines}\n\n"
-        f"{'':>50} Subtotal: {symbol}{subtotal:>12,.2f}\n"
-        f"{'':>50}      Tax: {symbol}{tax:>12,.2f} ({tax_rate*100:.1f}%)\n"
-        f"{'':>50}    TOTAL: {symbol}{total:>12,.2f}\n\n"
+        f"{INVOICE_TOTALS_PAD} Subtotal: {symbol}{subtotal:>12,.2f}\n"
+        f"{INVOICE_TOTALS_PAD}      Tax: {symbol}{tax_str:>12} ({tax_rate*100:.1f}%)\n"
+        f"{INVOICE_TOTALS_PAD}    TOTAL: {symbol}{total_str:>12}\n\n"
         f"Payment Terms: {terms}\n"
         f"Payment Account: {acct}\n\n"
         f"Thank you for your business."
@@ -255,8 +350,8 @@ def _generate_invoice(rng: random.Random) -> tuple[str, dict]:
         "payment_terms": terms,
         "due_date": due_date,
         "summary": (
-            f"Invoice {inv_num} from {issuer} to {recipient} for {symbol}{total:,.2f} {currency_code}. "
-            f"{len(line_items)} line items, tax {symbol}{tax:,.2f}. Payment terms: {terms}."
+            f"Invoice {inv_num} from {issuer} to {recipient} for {symbol}{total_str} {currency_code}. "
+            f"{len(line_items)} line items, tax {symbol}{tax_str}. Payment terms: {terms}."
         ),
     }
 
@@ -264,45 +359,46 @@ def _generate_invoice(rng: random.Random) -> tuple[str, dict]:
 
 
 def _generate_bank_statement(rng: random.Random) -> tuple[str, dict]:
-    bank_name = rng.choice([
-        "First National Bank", "Citizens Federal Bank", "Pacific Coast Credit Union",
-        "Heritage Savings Bank", "Metro Commercial Bank", "Cornerstone Financial",
-    ])
+    bank_name = rng.choice(BANK_NAMES)
     holder = rng.choice(COMPANY_NAMES)
-    currency_code, symbol = rng.choice(CURRENCIES[:3])  # USD/EUR/GBP for bank statements
+    currency_code, symbol = rng.choice(STATEMENT_CURRENCIES)
     acct = _random_account_number(rng)
     date = _random_date(rng)
     month = int(date.split("-")[1])
-    month_names = ["", "January", "February", "March", "April", "May", "June",
-                   "July", "August", "September", "October", "November", "December"]
 
     # Generate transactions
     n_txns = rng.randint(8, 20)
-    chosen_txns = [rng.choice(BANK_TRANSACTION_TYPES) for _ in range(n_txns)]
+    chosen_txns = rng.choices(BANK_TRANSACTION_TYPES, k=n_txns)
 
     line_items = []
-    running_balance = round(rng.uniform(5000, 50000), 2)
-    opening_balance = running_balance
+    opening_balance = round(rng.uniform(5000, 50000), 2)
 
+    # Only the closing balance is reported, so it is derived from the credit and
+    # debit sums (each rounded once) rather than rounded after every transaction.
+    total_credits = 0
+    total_debits = 0
     for desc, (lo, hi) in chosen_txns:
         amount = round(rng.uniform(lo, hi), 2)
-        is_credit = "deposit" in desc.lower() or "refund" in desc.lower() or "earned" in desc.lower()
-        if not is_credit:
+        if desc in CREDIT_TRANSACTIONS:
+            total_credits += amount
+        else:
             amount = -amount
-        running_balance = round(running_balance + amount, 2)
+            total_debits += amount
         line_items.append({
             "description": desc,
             "total": amount,
         })
 
-    closing_balance = running_balance
-    total_credits = round(sum(item["total"] for item in line_items if item["total"] > 0), 2)
-    total_debits = round(sum(item["total"] for item in line_items if item["total"] < 0), 2)
+    total_credits = round(total_credits, 2)
+    total_debits = round(total_debits, 2)
+    closing_balance = round(opening_balance + total_credits + total_debits, 2)
+    opening_str = f"{opening_balance:,.2f}"
+    closing_str = f"{closing_balance:,.2f}"
 
-    txn_lines = "\n".join(
-        f"  {_random_date(rng)}  {item['description']:<40} {symbol}{item['total']:>12,.2f}"
-        for item in line_items
-    )
+    txn_lines = "\n".join([
+        f"  {txn_date}  {item['description']:<40} {symbol}{item['total']:>12,.2f}"
+        for txn_date, item in zip(_random_dates(rng, n_txns), line_items)
+    ])
 
     text = (
         f"BANK STATEMENT\n"
@@ -310,12 +406,12 @@ def _generate_bank_statement(rng: random.Random) -> tuple[str, dict]:
         f"{bank_name}\n"
         f"Account Holder: {holder}\n"
         f"Account: {acct}\n"
-        f"Statement Period: {month_names[month]} 2024\n\n"
-        f"Opening Balance: {symbol}{opening_balance:>12,.2f}\n\n"
+        f"Statement Period: {MONTH_NAMES[month]} 2024\n\n"
+        f"Opening Balance: {symbol}{opening_str:>12}\n\n"
         f"TRANSACTIONS:\n{txn_lines}\n\n"
         f"Total Credits:  {symbol}{total_credits:>12,.2f}\n"
         f"Total Debits:   {symbol}{total_debits:>12,.2f}\n"
-        f"Closing Balance: {symbol}{closing_balance:>12,.2f}\n"
+        f"Closing Balance: {symbol}{closing_str:>12}\n"
     )
 
     structured = {
@@ -334,8 +430,8 @@ def _generate_bank_statement(rng: random.Random) -> tuple[str, dict]:
         "due_date": "N/A",
         "summary": (
             f"Bank statement for {holder} at {bank_name}, account {acct}. "
-            f"{month_names[month]} 2024. {len(line_items)} transactions. "
-            f"Opening balance {symbol}{opening_balance:,.2f}, closing balance {symbol}{closing_balance:,.2f}."
+            f"{MONTH_NAMES[month]} 2024. {len(line_items)} transactions. "
+            f"Opening balance {symbol}{opening_str}, closing balance {symbol}{closing_str}."
         ),
     }
 
@@ -346,37 +442,44 @@ def _generate_financial_statement(rng: random.Random) -> tuple[str, dict]:
     company = rng.choice(COMPANY_NAMES)
     currency_code, symbol = "USD", "$"
     date = _random_date(rng)
-    fiscal_year = rng.choice([2022, 2023, 2024])
+    fiscal_year = rng.choice(TAX_YEARS)
     tax_id = _random_tax_id(rng)
 
     # Revenue items
     rev_items = []
+    rev_rows = []
+    total_revenue = 0
     for desc, (lo, hi) in FINANCIAL_STATEMENT_ITEMS["revenue"]:
         if rng.random() > 0.3:
             amount = round(rng.uniform(lo, hi), 2)
+            total_revenue += amount
             rev_items.append({"description": desc, "total": amount})
+            rev_rows.append(f"  {desc:<45} {symbol}{amount:>15,.2f}")
 
     # Expense items
     exp_items = []
+    exp_rows = []
+    total_expenses = 0
     for desc, (lo, hi) in FINANCIAL_STATEMENT_ITEMS["expenses"]:
         if rng.random() > 0.2:
             amount = round(rng.uniform(lo, hi), 2)
+            total_expenses -= amount
             exp_items.append({"description": desc, "total": -amount})
+            exp_rows.append(f"  {desc:<45} ({symbol}{amount:>14,.2f})")
 
-    total_revenue = round(sum(item["total"] for item in rev_items), 2)
-    total_expenses = round(sum(item["total"] for item in exp_items), 2)
+    total_revenue = round(total_revenue, 2)
+    total_expenses = round(total_expenses, 2)
     net_income = round(total_revenue + total_expenses, 2)  # expenses are negative
     tax_amount = round(max(0, net_income * rng.uniform(0.15, 0.25)), 2)
     net_after_tax = round(net_income - tax_amount, 2)
+    revenue_str = f"{total_revenue:,.2f}"
+    expenses_str = f"{abs(total_expenses):,.2f}"
+    net_after_tax_str = f"{net_after_tax:,.2f}"
 
     all_items = rev_items + exp_items
 
-    rev_lines = "\n".join(
-        f"  {item['description']:<45} {symbol}{item['total']:>15,.2f}" for item in rev_items
-    )
-    exp_lines = "\n".join(
-        f"  {item['description']:<45} ({symbol}{abs(item['total']):>14,.2f})" for item in exp_items
-    )
+    rev_lines = "\n".join(rev_rows)
+    exp_lines = "\n".join(exp_rows)
 
     text = (
         f"INCOME STATEMENT (10-K Summary)\n"
@@ -385,15 +488,15 @@ def _generate_financial_statement(rng: random.Random) -> tuple[str, dict]:
         f"Fiscal Year Ended December 31, {fiscal_year}\n"
         f"(In USD)\n\n"
         f"REVENUE:\n{rev_lines}\n"
-        f"{'':>45} {'─'*17}\n"
-        f"  {'Total Revenue':<45} {symbol}{total_revenue:>15,.2f}\n\n"
+        f"{STATEMENT_RULE}\n"
+        f"  {STATEMENT_LABELS['Total Revenue']} {symbol}{revenue_str:>15}\n\n"
         f"OPERATING EXPENSES:\n{exp_lines}\n"
-        f"{'':>45} {'─'*17}\n"
-        f"  {'Total Expenses':<45} ({symbol}{abs(total_expenses):>14,.2f})\n\n"
-        f"  {'Operating Income':<45} {symbol}{net_income:>15,.2f}\n"
-        f"  {'Income Tax':<45} ({symbol}{tax_amount:>14,.2f})\n"
-        f"{'':>45} {'═'*17}\n"
-        f"  {'NET INCOME':<45} {symbol}{net_after_tax:>15,.2f}\n"
+        f"{STATEMENT_RULE}\n"
+        f"  {STATEMENT_LABELS['Total Expenses']} ({symbol}{expenses_str:>14})\n\n"
+        f"  {STATEMENT_LABELS['Operating Income']} {symbol}{net_income:>15,.2f}\n"
+        f"  {STATEMENT_LABELS['Income Tax']} ({symbol}{tax_amount:>14,.2f})\n"
+        f"{STATEMENT_DOUBLE_RULE}\n"
+        f"  {STATEMENT_LABELS['NET INCOME']} {symbol}{net_after_tax_str:>15}\n"
     )
 
     structured = {
@@ -412,8 +515,8 @@ def _generate_financial_statement(rng: random.Random) -> tuple[str, dict]:
         "due_date": "N/A",
         "summary": (
             f"Income statement for {company}, FY{fiscal_year}. "
-            f"Total revenue {symbol}{total_revenue:,.2f}, total expenses {symbol}{abs(total_expenses):,.2f}. "
-            f"Net income after tax: {symbol}{net_after_tax:,.2f}."
+            f"Total revenue {symbol}{revenue_str}, total expenses {symbol}{expenses_str}. "
+            f"Net income after tax: {symbol}{net_after_tax_str}."
         ),
     }
 
@@ -423,9 +526,9 @@ def _generate_financial_statement(rng: random.Random) -> tuple[str, dict]:
 def _generate_tax_form(rng: random.Random) -> tuple[str, dict]:
     form_type = rng.choice(TAX_FORM_TYPES)
     payer = rng.choice(COMPANY_NAMES)
-    recipient_name = f"{rng.choice(['John', 'Jane', 'Robert', 'Maria', 'David', 'Sarah', 'Michael', 'Lisa'])} {rng.choice(['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis'])}"
+    recipient_name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
     currency_code, symbol = "USD", "$"
-    tax_year = rng.choice([2022, 2023, 2024])
+    tax_year = rng.choice(TAX_YEARS)
     payer_tin = _random_tax_id(rng)
     recipient_tin = _random_tax_id(rng)
 
@@ -437,6 +540,7 @@ def _generate_tax_form(rng: random.Random) -> tuple[str, dict]:
         medicare_tax = round(wages * 0.0145, 2)
         state_tax = round(wages * rng.uniform(0.02, 0.10), 2)
         total = wages
+        total_str = f"{total:,.2f}"
 
         line_items = [
             {"description": "Wages, tips, other compensation", "total": wages},
@@ -454,11 +558,11 @@ def _generate_tax_form(rng: random.Random) -> tuple[str, dict]:
             f"Tax Year: {tax_year}\n\n"
             f"EMPLOYER:\n  {payer}\n  EIN: {payer_tin}\n\n"
             f"EMPLOYEE:\n  {recipient_name}\n  SSN: {recipient_tin}\n\n"
-            f"Box 1 - Wages: {symbol}{wages:>12,.2f}\n"
+            f"Box 1 - Wages: {symbol}{total_str:>12}\n"
             f"Box 2 - Federal tax withheld: {symbol}{fed_tax:>12,.2f}\n"
             f"Box 3 - Social security wages: {symbol}{ss_wages:>12,.2f}\n"
             f"Box 4 - Social security tax: {symbol}{ss_tax:>12,.2f}\n"
-            f"Box 5 - Medicare wages: {symbol}{wages:>12,.2f}\n"
+            f"Box 5 - Medicare wages: {symbol}{total_str:>12}\n"
             f"Box 6 - Medicare tax: {symbol}{medicare_tax:>12,.2f}\n"
             f"Box 17 - State income tax: {symbol}{state_tax:>12,.2f}\n"
         )
@@ -467,6 +571,7 @@ def _generate_tax_form(rng: random.Random) -> tuple[str, dict]:
         amount = round(rng.uniform(500, 100000), 2)
         fed_tax = round(amount * rng.uniform(0, 0.24), 2)
         total = amount
+        total_str = f"{total:,.2f}"
         tax = fed_tax
 
         line_items = [
@@ -488,7 +593,7 @@ def _generate_tax_form(rng: random.Random) -> tuple[str, dict]:
             f"Tax Year: {tax_year}\n\n"
             f"PAYER:\n  {payer}\n  TIN: {payer_tin}\n\n"
             f"RECIPIENT:\n  {recipient_name}\n  TIN: {recipient_tin}\n\n"
-            f"{income_type}: {symbol}{amount:>12,.2f}\n"
+            f"{income_type}: {symbol}{total_str:>12}\n"
             + (f"Federal tax withheld: {symbol}{fed_tax:>12,.2f}\n" if fed_tax > 0 else "")
         )
 
@@ -509,7 +614,7 @@ def _generate_tax_form(rng: random.Random) -> tuple[str, dict]:
         "summary": (
             f"Form {form_type} for tax year {tax_year}. "
             f"Payer: {payer}. Recipient: {recipient_name}. "
-            f"Total reported: {symbol}{total:,.2f}, tax withheld: {symbol}{tax:,.2f}."
+            f"Total reported: {symbol}{total_str}, tax withheld: {symbol}{tax:,.2f}."
         ),
     }
 
@@ -518,51 +623,39 @@ def _generate_tax_form(rng: random.Random) -> tuple[str, dict]:
 
 def _generate_receipt(rng: random.Random) -> tuple[str, dict]:
     store = rng.choice(COMPANY_NAMES)
-    currency_code, symbol = rng.choice(CURRENCIES[:3])
+    currency_code, symbol = rng.choice(STATEMENT_CURRENCIES)
     date = _random_date(rng)
 
-    receipt_items = [
-        ("Office paper, A4 ream", (5, 15)),
-        ("Printer ink cartridge", (20, 80)),
-        ("USB flash drive 32GB", (8, 25)),
-        ("Wireless mouse", (15, 50)),
-        ("Desk lamp", (20, 80)),
-        ("Notebook, ruled", (3, 12)),
-        ("Pens, pack of 10", (5, 15)),
-        ("Stapler", (8, 25)),
-        ("Whiteboard markers", (5, 20)),
-        ("Coffee beans, 1kg", (10, 30)),
-        ("Bottled water, case", (5, 15)),
-        ("Cleaning supplies", (10, 40)),
-        ("First aid kit", (15, 50)),
-        ("Extension cord", (10, 30)),
-        ("Cable organizer", (5, 20)),
-    ]
-
     n_items = rng.randint(1, 6)
-    chosen = rng.sample(receipt_items, min(n_items, len(receipt_items)))
+    chosen = sample_distinct(rng, RECEIPT_ITEMS, min(n_items, len(RECEIPT_ITEMS)))
+
+    quantities = rng.choices(RECEIPT_QUANTITIES, k=len(chosen))
 
     line_items = []
-    for desc, (lo, hi) in chosen:
-        qty = rng.randint(1, 5)
+    item_rows = []
+    subtotal = 0
+    for (desc, (lo, hi)), qty in zip(chosen, quantities):
         unit_price = round(rng.uniform(lo, hi), 2)
         total = round(qty * unit_price, 2)
+        subtotal += total
         line_items.append({
             "description": desc,
             "quantity": qty,
             "unit_price": unit_price,
             "total": total,
         })
+        item_rows.append(
+            f"  {desc:<30} {qty:>2} x {symbol}{unit_price:>7,.2f}  {symbol}{total:>8,.2f}"
+        )
 
-    subtotal = round(sum(i["total"] for i in line_items), 2)
-    tax_rate = rng.choice([0.0, 0.05, 0.06, 0.07, 0.08, 0.10])
+    subtotal = round(subtotal, 2)
+    tax_rate = rng.choice(RECEIPT_TAX_RATES)
     tax = round(subtotal * tax_rate, 2)
     total = round(subtotal + tax, 2)
+    tax_str = f"{tax:,.2f}"
+    total_str = f"{total:,.2f}"
 
-    item_lines = "\n".join(
-        f"  {item['description']:<30} {item['quantity']:>2} x {symbol}{item['unit_price']:>7,.2f}  {symbol}{item['total']:>8,.2f}"
-        for item in line_items
-    )
+    item_lines = "\n".join(item_rows)
 
     text = (
         f"RECEIPT\n"
@@ -573,9 +666,9 @@ def _generate_receipt(rng: random.Random) -> tuple[str, dict]:
         f"{'─'*40}\n"
         f"{item_lines}\n"
         f"{'─'*40}\n"
-        f"{'Subtotal:':>35} {symbol}{subtotal:>8,.2f}\n"
-        f"{'Tax:':>35} {symbol}{tax:>8,.2f}\n"
-        f"{'TOTAL:':>35} {symbol}{total:>8,.2f}\n"
+        f"{RECEIPT_LABELS['Subtotal:']} {symbol}{subtotal:>8,.2f}\n"
+        f"{RECEIPT_LABELS['Tax:']} {symbol}{tax_str:>8}\n"
+        f"{RECEIPT_LABELS['TOTAL:']} {symbol}{total_str:>8}\n"
         f"{'─'*40}\n"
         f"Payment: {'Credit Card' if rng.random() > 0.3 else 'Cash'}\n"
         f"Thank you for your purchase!"
@@ -597,7 +690,7 @@ def _generate_receipt(rng: random.Random) -> tuple[str, dict]:
         "due_date": "N/A",
         "summary": (
             f"Receipt from {store} dated {date}. "
-            f"{len(line_items)} item(s), total {symbol}{total:,.2f} {currency_code} including {symbol}{tax:,.2f} tax."
+            f"{len(line_items)} item(s), total {symbol}{total_str} {currency_code} including {symbol}{tax_str} tax."
         ),
     }
 
@@ -627,33 +720,33 @@ DOC_TYPE_WEIGHTS = {
 }
 
 
-def generate_examples(count: int, seed: int) -> list[dict]:
-    """Generate *count* financial training examples."""
+MAX_EXAMPLE_TOKENS = 4096
+
+
+def _generate_chunk(task: tuple[str, int, int, int, str]) -> tuple[int, int, dict[str, int]]:
+    """Generate a chunk of one document type into a JSONL shard (pool worker entrypoint).
+
+    Args:
+        task: ``(doc_type, seed, start_idx, n, shard_path)`` — the document
+            type, the chunk's seed, the run-wide index of its first example
+            (unused), how many examples to attempt, and the JSONL file to write
+            them to.
+
+    Returns:
+        ``(written, skipped, {})`` — how many examples were written and how
+        many were dropped for exceeding the token limit.
+    """
+    doc_type, seed, _, n, shard_path = task
     rng = random.Random(seed)
-    examples = []
+    gen_fn = GENERATORS[doc_type]
+    written = 0
     skipped = 0
 
-    # Compute per-type counts
-    type_counts = {}
-    remaining = count
-    for doc_type, weight in DOC_TYPE_WEIGHTS.items():
-        n = int(count * weight)
-        type_counts[doc_type] = n
-        remaining -= n
-    for doc_type in list(type_counts.keys()):
-        if remaining <= 0:
-            break
-        type_counts[doc_type] += 1
-        remaining -= 1
-
-    for doc_type, n in type_counts.items():
-        gen_fn = GENERATORS[doc_type]
+    with open(shard_path, "w", encoding="utf-8") as out:
         for _ in range(n):
             text, structured = gen_fn(rng)
-            assistant_content = json.dumps(structured, indent=2, ensure_ascii=False)
-
-            total_text = SYSTEM_PROMPT + text + assistant_content
-            if estimate_tokens(total_text) > 4096:
+            assistant_content = dump_json_indented(structured)
+            if estimate_tokens_parts(SYSTEM_PROMPT, text, assistant_content) > MAX_EXAMPLE_TOKENS:
                 skipped += 1
                 continue
 
@@ -666,13 +759,49 @@ def generate_examples(count: int, seed: int) -> list[dict]:
             )
 
             example = make_conversation(SYSTEM_PROMPT, user_msg, assistant_content)
-            examples.append(example)
+
+            out.write(dump_json_line(example))
+            out.write("\n")
+            written += 1
+
+    return written, skipped, {}
+
+
+def generate_examples(
+    count: int, seed: int, jsonl_path: str | Path, workers: int = 1
+) -> dict[str, int]:
+    """Generate *count* financial training examples into a JSON Lines file.
+
+    Work is split into seeded per-type chunks and spread over *workers*
+    processes by ``shared.generate_sharded``, which streams each chunk's shard
+    into *jsonl_path*.
+
+    Returns:
+        The number of examples written per document type.  Types whose
+        examples were all skipped for the token limit are omitted.
+    """
+    # Compute per-type counts
+    type_counts = {}
+    remaining = count
+    for doc_type, weight in DOC_TYPE_WEIGHTS.items():
+        n = int(count * weight)
+        type_counts[doc_type] = n
+        remaining -= n
+    for doc_type in list(type_counts.keys()):
+        if remaining <= 0:
+            break
+        type_counts[doc_type] += 1
+        remaining -= 1
+
+    type_dist, _, skipped = generate_sharded(
+        _generate_chunk, type_counts, seed, jsonl_path, workers=workers
+    )
 
     if skipped:
         logger.info("Skipped %d examples (token limit)", skipped)
 
-    logger.info("Generated %d financial examples", len(examples))
-    return examples
+    logger.info("Generated %d financial examples", sum(type_dist.values()))
+    return type_dist
 
 
 # ---------------------------------------------------------------------------
@@ -692,6 +821,10 @@ def main() -> None:
         "--dry-run", action="store_true",
         help="Generate a small sample (50 examples) for testing",
     )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1,
+        help="Worker processes for generation (default: CPU count)",
+    )
     add_seed_argument(parser)
     args = parser.parse_args()
 
@@ -701,24 +834,21 @@ def main() -> None:
         count, args.seed, ", DRY RUN" if args.dry_run else "",
     )
 
-    examples = generate_examples(count, args.seed)
-
     output_dir = DATASETS_DIR / "financial"
-    counts = save_dataset(examples, output_dir, seed=args.seed)
+    with tempfile.TemporaryDirectory(prefix="prepare_financial_") as tmp_dir:
+        jsonl_path = Path(tmp_dir) / "all.jsonl"
+        type_dist = generate_examples(count, args.seed, jsonl_path, workers=args.workers)
+        counts = save_dataset_from_jsonl([jsonl_path], output_dir, seed=args.seed)
 
     logger.info("Dataset saved to %s", output_dir)
     for split, n in counts.items():
         logger.info("  %s: %d examples", split, n)
 
-    # Distribution stats
-    type_dist: dict[str, int] = {}
-    for ex in examples:
-        doc = json.loads(ex["messages"][2]["content"])
-        dt = doc["document_type"]
-        type_dist[dt] = type_dist.get(dt, 0) + 1
+    # Distribution stats, from the per-chunk counters (examples are not re-read)
+    total = sum(counts.values())
     logger.info("Document type distribution:")
     for dt, n in sorted(type_dist.items()):
-        logger.info("  %s: %d (%.1f%%)", dt, n, 100 * n / len(examples))
+        logger.info("  %s: %d (%.1f%%)", dt, n, 100 * n / total)
 
 
 if __name__ == "__main__":
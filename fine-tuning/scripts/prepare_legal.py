@@ -11,14 +11,16 @@ Usage:
     python prepare_legal.py                # Full run (5000 examples)
     python prepare_legal.py --dry-run      # Quick test (50 examples)
     python prepare_legal.py --count 2000   # Custom count
+    python prepare_legal.py --pretty       # Indented assistant JSON
 """
 
 from __future__ import annotations
 
 import argparse
-import json
+import os
 import random
 import sys
+import tempfile
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
@@ -26,9 +28,15 @@ sys.path.insert(0, str(Path(__file__).resolve().parent))
 from shared import (
     DATASETS_DIR,
     add_seed_argument,
+    dump_json_indented,
+    dump_json_line,
+    encode_json_line,
     estimate_tokens,
+    estimate_tokens_parts,
+    generate_sharded,
     make_conversation,
-    save_dataset,
+    sample_distinct,
+    save_dataset_from_jsonl,
     setup_logging,
 )
 
@@ -50,81 +58,81 @@ SYSTEM_PROMPT = (
 # Data pools
 # ---------------------------------------------------------------------------
 
-DOCUMENT_TYPES = [
+DOCUMENT_TYPES = (
     "complaint", "motion", "brief", "opinion",
     "contract", "correspondence", "memo",
-]
+)
 
 # Case topics for relevance categories
-CASE_TOPICS = [
+CASE_TOPICS = (
     "patent infringement", "breach of contract", "employment discrimination",
     "securities fraud", "antitrust violation", "trade secret misappropriation",
     "product liability", "medical malpractice", "insurance dispute",
     "environmental regulation", "intellectual property", "merger review",
     "tax dispute", "real estate litigation", "class action",
     "whistleblower retaliation", "data privacy breach", "copyright infringement",
-]
+)
 
-RELEVANCE_CATEGORIES = [
+RELEVANCE_CATEGORIES = (
     "damages", "liability", "causation", "regulatory compliance",
     "contractual obligations", "prior art", "trade secrets",
     "employment practices", "financial records", "corporate governance",
     "communications", "technical specifications", "market analysis",
     "competitive practices", "internal policies", "discovery materials",
-]
+)
 
-PRIVILEGE_TYPES = ["none", "attorney_client", "work_product", "joint_defense"]
+PRIVILEGE_TYPES = ("none", "attorney_client", "work_product", "joint_defense")
 
 PRIVILEGE_REASONING = {
-    "none": [
+    "none": (
         "Document is a business communication with no legal advice sought or provided.",
         "Publicly filed document with no privilege protection.",
         "Internal business memorandum discussing operational matters only.",
         "Communication between non-legal parties regarding business operations.",
         "Document was shared with third parties, waiving any potential privilege.",
-    ],
-    "attorney_client": [
+    ),
+    "attorney_client": (
         "Communication between client and counsel seeking legal advice on the matter.",
         "Email from in-house counsel providing legal analysis of proposed transaction.",
         "Memorandum from outside counsel advising on litigation strategy.",
         "Confidential communication with attorney regarding pending legal action.",
         "Letter from counsel analyzing legal risks associated with business decision.",
-    ],
-    "work_product": [
+    ),
+    "work_product": (
         "Litigation memorandum prepared by counsel in anticipation of litigation.",
         "Attorney's mental impressions and legal theories documented for case preparation.",
         "Investigation report prepared at direction of counsel for litigation purposes.",
         "Draft legal brief with attorney annotations and strategy notes.",
         "Case analysis prepared by legal team for litigation planning.",
-    ],
-    "joint_defense": [
+    ),
+    "joint_defense": (
         "Communication shared under joint defense agreement between co-defendants.",
         "Strategy memorandum circulated among parties to joint defense arrangement.",
         "Joint defense meeting notes shared among aligned parties' counsel.",
         "Coordinated legal analysis shared under common interest doctrine.",
-    ],
+    ),
 }
 
 # Entity pools
-PERSON_NAMES = [
+PERSON_NAMES = (
     "James Anderson", "Maria Rodriguez", "Robert Chen", "Sarah Williams",
     "Michael Thompson", "Jennifer Garcia", "David Kim", "Lisa Martinez",
     "John Wilson", "Patricia Moore", "Richard Taylor", "Elizabeth Johnson",
     "Thomas Brown", "Margaret Davis", "Christopher Lee", "Barbara White",
     "Daniel Harris", "Susan Clark", "Mark Robinson", "Nancy Lewis",
     "Steven Walker", "Karen Hall", "Paul Allen", "Betty Young",
-]
+)
 
-ORGANIZATION_NAMES = [
+ORGANIZATION_NAMES = (
     "Meridian Holdings Inc.", "Pacific Ventures LLC", "Atlas Manufacturing Co.",
     "Pinnacle Technologies Corp.", "Summit Financial Group", "Horizon Enterprises Ltd.",
     "Quantum Systems International", "Sterling Capital Partners", "Vanguard Industries",
     "Nexus Global Solutions", "Beacon Health Systems", "Ironclad Security Inc.",
     "Silverstone Properties", "Evergreen Resources Corp.", "Titan Aerospace LLC",
     "Cobalt Pharmaceuticals Inc.", "Diamond Data Analytics", "Sapphire Energy Corp.",
-]
+)
 
-COURT_NAMES = [
+COURT_NAMES = (
     "United States District Court for the Southern District of New York",
     "United States District Court for the Northern District of California",
     "United States District Court for the District of Delaware",
@@ -135,9 +143,15 @@ COURT_NAMES = [
     "United States Court of Appeals for the Federal Circuit",
     "Superior Court of California, County of Los Angeles",
     "Supreme Court of the State of New York",
-]
+)
+
+# Short court name used in complaint summaries, derived once per court.
+COURT_SHORT_NAMES = {
+    court: court.split(",")[0] if "," in court else court.split("for")[0].strip()
+    for court in COURT_NAMES
+}
 
-STATUTE_NAMES = [
+STATUTE_NAMES = (
     "35 U.S.C. § 271 (Patent Infringement)",
     "15 U.S.C. § 1 (Sherman Antitrust Act)",
     "42 U.S.C. § 2000e (Title VII, Civil Rights Act)",
@@ -150,54 +164,178 @@ STATUTE_NAMES = [
     "17 U.S.C. § 106 (Copyright Act)",
     "Cal. Bus. & Prof. Code § 17200 (Unfair Competition Law)",
     "N.Y. Gen. Bus. Law § 349 (Consumer Protection)",
-]
+)
 
-ATTORNEY_NAMES = [
+ATTORNEY_NAMES = (
     "Attorney Sarah Mitchell", "Counsel David Park", "Attorney Jennifer Adams",
     "Counsel Michael Torres", "Attorney Robert Singh", "Counsel Amanda Chen",
     "Attorney William Foster", "Counsel Rachel Green", "Attorney James Cooper",
     "Counsel Emily Watson",
-]
+)
 
-LEGAL_ROLES = [
+LEGAL_ROLES = (
     "plaintiff", "defendant", "plaintiff's counsel", "defendant's counsel",
     "witness", "expert witness", "judge", "mediator", "third-party defendant",
     "intervenor", "amicus curiae",
-]
+)
+
+# (title, relief sought)
+MOTION_TYPES = (
+    ("Motion to Dismiss", "dismissal of the complaint for failure to state a claim"),
+    ("Motion for Summary Judgment", "summary judgment on all counts"),
+    ("Motion to Compel Discovery", "an order compelling production of documents"),
+    ("Motion in Limine", "exclusion of certain evidence at trial"),
+    ("Motion to Strike", "striking portions of the opposing party's pleading"),
+    ("Motion for Protective Order", "a protective order regarding confidential materials"),
+)
+
+BRIEF_TYPES = (
+    "Opening Brief in Support of Motion for Summary Judgment",
+    "Opposition Brief to Motion to Dismiss",
+    "Reply Brief in Support of Motion to Compel",
+    "Appellate Brief",
+    "Amicus Curiae Brief",
+)
+
+CONTRACT_TYPES = (
+    "Master Services Agreement", "Non-Disclosure Agreement",
+    "Software License Agreement", "Settlement Agreement",
+    "Supply Agreement", "Joint Venture Agreement",
+)
+
+# Case-converted forms of pool strings used in document text, derived once
+# here so the generators' text templates only interpolate.
+HEADINGS_UPPER = {
+    title: title.upper()
+    for title in (*COURT_NAMES, *(t for t, _ in MOTION_TYPES), *BRIEF_TYPES, *CONTRACT_TYPES)
+}
+BRIEF_TYPES_LOWER = {title: title.lower() for title in BRIEF_TYPES}
+CASE_TOPICS_TITLE = {topic: topic.title() for topic in CASE_TOPICS}
+
+# Motion text that depends on whether the motion is a motion to dismiss:
+# (position, challenged record, supporting argument).
+MOTION_ARGUMENTS = {
+    True: (
+        "the complaint fails to state a claim upon which relief can be granted",
+        "complaint",
+        "Plaintiff has not alleged sufficient facts.",
+    ),
+    False: (
+        "the relief requested is warranted under the applicable standard",
+        "evidence",
+        "The undisputed facts warrant the relief sought.",
+    ),
+}
+
+# Opinion findings per outcome: (prevailing showing, evidence support).
+OPINION_FINDINGS = {
+    "granted": ("defendant has not established", "does not support"),
+    "denied": ("plaintiff has established", "supports"),
+    "granted in part and denied in part": ("defendant has not established", "does not support"),
+}
+OPINION_OUTCOMES = tuple(OPINION_FINDINGS)
+
+# Memo subject templates with their memo type.  Only the picked subject is
+# formatted, with the case topic and the upcoming proceeding.
+MEMO_SUBJECTS = (
+    ("Legal analysis of {topic} claims", "legal analysis"),
+    ("Case strategy for upcoming {proceeding}", "strategy"),
+    ("Review of document production in {topic} matter", "discovery review"),
+    ("Risk assessment — {topic} litigation exposure", "risk assessment"),
+    ("Summary of witness interviews — {topic}", "witness summary"),
+)
+MEMO_PROCEEDINGS = ("deposition", "hearing", "mediation", "trial")
+
+
+# Every date a generator can emit (years 2022-2024, months 1-12, days 1-28),
+# formatted once.  Picking uniformly from it is the same distribution as
+# drawing year, month and day independently, at one RNG call per date.
+DATE_POOL = tuple(
+    f"{year}-{month:02d}-{day:02d}"
+    for year in (2022, 2023, 2024)
+    for month in range(1, 13)
+    for day in range(1, 29)
+)
+
+# Docket prefixes "<division>:<year>-cv-" (divisions 1-9, years 20-24); the
+# case number appends a 4-digit sequence number in 1000-9999.
+CASE_NO_PREFIXES = tuple(
+    f"{division}:{year}-cv-" for division in range(1, 10) for year in range(20, 25)
+)
+CASE_NO_SEQUENCES = 9000
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
+# The helpers below are called several times per document, so they draw
+# indices as ``int(rng.random() * n)`` (as ``random.choices`` does): one C call
+# per draw, instead of the Python-level frames behind ``choice``/``randrange``.
+
+
+def _randint(rng: random.Random, a: int, b: int) -> int:
+    """Draw an int in ``[a, b]``, like ``rng.randint(a, b)`` but from one ``rng.random()``."""
+    return a + int(rng.random() * (b - a + 1))
+
 
 def _random_date(rng: random.Random) -> str:
-    year = rng.choice([2022, 2023, 2024])
-    month = rng.randint(1, 12)
-    day = rng.randint(1, 28)
-    return f"{year}-{month:02d}-{day:02d}"
+    """Pick a ``YYYY-MM-DD`` date from ``DATE_POOL``; nothing is formatted per call."""
+    return DATE_POOL[int(rng.random() * len(DATE_POOL))]
+
+
+def _random_case_no(rng: random.Random) -> str:
+    """Draw a case number such as ``3:22-cv-4821`` with a single RNG call."""
+    draw = int(rng.random() * (len(CASE_NO_PREFIXES) * CASE_NO_SEQUENCES))
+    prefix_idx, seq = divmod(draw, CASE_NO_SEQUENCES)
+    return f"{CASE_NO_PREFIXES[prefix_idx]}{1000 + seq}"
+
+
+def _choice_excluding(rng: random.Random, pool: tuple[str, ...], excluded_idx: int) -> str:
+    """Pick an element of *pool* other than ``pool[excluded_idx]``.
+
+    Draws an index over the remaining ``len(pool) - 1`` slots and skips past
+    the excluded one, so no filtered copy of *pool* is built.
+    """
+    j = int(rng.random() * (len(pool) - 1))
+    return pool[j if j < excluded_idx else j + 1]
+
+
+def _distinct_pair(rng: random.Random, pool: tuple[str, ...]) -> tuple[str, str]:
+    """Pick two different elements of *pool*."""
+    i = int(rng.random() * len(pool))
+    return pool[i], _choice_excluding(rng, pool, i)
+
+
+def _privilege_reasoning(rng: random.Random, privilege_type: str) -> str:
+    """Pick a reasoning sentence for *privilege_type*."""
+    reasons = PRIVILEGE_REASONING[privilege_type]
+    return reasons[int(rng.random() * len(reasons))]
 
 
 def _pick_entities(rng: random.Random, min_n: int = 2, max_n: int = 6) -> list[dict]:
     """Generate a varied set of entities for a legal document."""
     entities = []
-    n = rng.randint(min_n, max_n)
+    n = _randint(rng, min_n, max_n)
 
     # Always include at least one person and one org
-    person = rng.choice(PERSON_NAMES)
-    org = rng.choice(ORGANIZATION_NAMES)
-    entities.append({"name": person, "type": "person", "role": rng.choice(["plaintiff", "defendant", "witness"])})
-    entities.append({"name": org, "type": "organization", "role": rng.choice(["plaintiff", "defendant", "third-party defendant"])})
-
+    person_idx = int(rng.random() * len(PERSON_NAMES))
+    org_idx = int(rng.random() * len(ORGANIZATION_NAMES))
+    person = PERSON_NAMES[person_idx]
+    org = ORGANIZATION_NAMES[org_idx]
+    entities.append({"name": person, "type": "person", "role": rng.choice(("plaintiff", "defendant", "witness"))})
+    entities.append({"name": org, "type": "organization", "role": rng.choice(("plaintiff", "defendant", "third-party defendant"))})
+
+    # Per-entity rng.choice: for at most four draws it beats a batched rng.choices.
     for _ in range(n - 2):
-        entity_type = rng.choice(["person", "organization", "court", "statute"])
+        entity_type = rng.choice(("person", "organization", "court", "statute"))
         if entity_type == "person":
-            name = rng.choice([p for p in PERSON_NAMES if p != person])
+            name = _choice_excluding(rng, PERSON_NAMES, person_idx)
             role = rng.choice(LEGAL_ROLES)
             entities.append({"name": name, "type": "person", "role": role})
         elif entity_type == "organization":
-            name = rng.choice([o for o in ORGANIZATION_NAMES if o != org])
-            role = rng.choice(["defendant", "third-party defendant", "intervenor"])
+            name = _choice_excluding(rng, ORGANIZATION_NAMES, org_idx)
+            role = rng.choice(("defendant", "third-party defendant", "intervenor"))
             entities.append({"name": name, "type": "organization", "role": role})
         elif entity_type == "court":
             entities.append({"name": rng.choice(COURT_NAMES), "type": "court", "role": "adjudicating court"})
@@ -208,17 +346,18 @@ def _pick_entities(rng: random.Random, min_n: int = 2, max_n: int = 6) -> list[d
 
 
 def _pick_dates(rng: random.Random, min_n: int = 1, max_n: int = 4) -> list[dict]:
-    events = [
+    events = (
         "Contract executed", "Alleged breach occurred", "Complaint filed",
         "Answer due", "Discovery deadline", "Motion hearing scheduled",
         "Mediation conference", "Trial date set", "Settlement conference",
         "Expert report deadline", "Deposition of key witness",
         "Document production deadline", "Summary judgment motion due",
         "Pre-trial conference", "Statute of limitations expires",
-    ]
-    n = rng.randint(min_n, max_n)
-    chosen = rng.sample(events, min(n, len(events)))
-    return [{"date": _random_date(rng), "event": e} for e in chosen]
+    )
+    n = _randint(rng, min_n, max_n)
+    chosen = sample_distinct(rng, events, min(n, len(events)))
+    dates = rng.choices(DATE_POOL, k=len(chosen))
+    return [{"date": date, "event": e} for date, e in zip(dates, chosen)]
 
 
 # ---------------------------------------------------------------------------
@@ -228,12 +367,11 @@ def _pick_dates(rng: random.Random, min_n: int = 1, max_n: int = 4) -> list[dict
 
 def _generate_complaint(rng: random.Random) -> tuple[str, dict]:
     plaintiff_person = rng.choice(PERSON_NAMES)
-    plaintiff_org = rng.choice(ORGANIZATION_NAMES)
-    defendant_org = rng.choice([o for o in ORGANIZATION_NAMES if o != plaintiff_org])
+    plaintiff_org, defendant_org = _distinct_pair(rng, ORGANIZATION_NAMES)
     court = rng.choice(COURT_NAMES)
     case_topic = rng.choice(CASE_TOPICS)
     statute = rng.choice(STATUTE_NAMES)
-    case_no = f"{rng.randint(1, 9)}:{rng.randint(20, 24)}-cv-{rng.randint(1000, 9999)}"
+    case_no = _random_case_no(rng)
     filing_date = _random_date(rng)
 
     entities = [
@@ -250,12 +388,13 @@ def _generate_complaint(rng: random.Random) -> tuple[str, dict]:
     ]
 
     relevance_score = round(rng.uniform(0.7, 1.0), 2)
-    categories = rng.sample(RELEVANCE_CATEGORIES, rng.randint(2, 4))
+    categories = sample_distinct(rng, RELEVANCE_CATEGORIES, _randint(rng, 2, 4))
 
     privilege_type = "none"  # Complaints are public filings
+    attorney = rng.choice(ATTORNEY_NAMES)
 
     text = (
-        f"IN THE {court.upper()}\n\n"
+        f"IN THE {HEADINGS_UPPER[court]}\n\n"
         f"Case No. {case_no}\n\n"
         f"{plaintiff_org},\n    Plaintiff,\n\n"
         f"v.\n\n"
@@ -289,7 +428,7 @@ def _generate_complaint(rng: random.Random) -> tuple[str, dict]:
         f"d. Grant such other relief as the Court deems just.\n\n"
         f"Dated: {filing_date}\n"
         f"Respectfully submitted,\n"
-        f"{rng.choice(ATTORNEY_NAMES)}\n"
+        f"{attorney}\n"
         f"Counsel for Plaintiff"
     )
 
@@ -302,12 +441,12 @@ def _generate_complaint(rng: random.Random) -> tuple[str, dict]:
         },
         "privilege": {
             "type": privilege_type,
-            "reasoning": rng.choice(PRIVILEGE_REASONING[privilege_type]),
+            "reasoning": _privilege_reasoning(rng, privilege_type),
         },
         "key_entities": entities,
         "dates": dates,
         "summary": (
-            f"Complaint filed by {plaintiff_org} against {defendant_org} in {court.split(',')[0] if ',' in court else court.split('for')[0].strip()} "
+            f"Complaint filed by {plaintiff_org} against {defendant_org} in {COURT_SHORT_NAMES[court]} "
             f"alleging {case_topic}. Case No. {case_no}."
         ),
     }
@@ -316,28 +455,20 @@ def _generate_complaint(rng: random.Random) -> tuple[str, dict]:
 
 
 def _generate_motion(rng: random.Random) -> tuple[str, dict]:
-    movant_org = rng.choice(ORGANIZATION_NAMES)
-    opponent_org = rng.choice([o for o in ORGANIZATION_NAMES if o != movant_org])
+    movant_org, opponent_org = _distinct_pair(rng, ORGANIZATION_NAMES)
     court = rng.choice(COURT_NAMES)
-    case_no = f"{rng.randint(1, 9)}:{rng.randint(20, 24)}-cv-{rng.randint(1000, 9999)}"
+    case_no = _random_case_no(rng)
     case_topic = rng.choice(CASE_TOPICS)
     attorney = rng.choice(ATTORNEY_NAMES)
 
-    motion_types = [
-        ("Motion to Dismiss", "dismissal of the complaint for failure to state a claim"),
-        ("Motion for Summary Judgment", "summary judgment on all counts"),
-        ("Motion to Compel Discovery", "an order compelling production of documents"),
-        ("Motion in Limine", "exclusion of certain evidence at trial"),
-        ("Motion to Strike", "striking portions of the opposing party's pleading"),
-        ("Motion for Protective Order", "a protective order regarding confidential materials"),
-    ]
-    motion_title, motion_relief = rng.choice(motion_types)
+    motion_title, motion_relief = rng.choice(MOTION_TYPES)
+    position, challenged, argument = MOTION_ARGUMENTS["Dismiss" in motion_title]
     filing_date = _random_date(rng)
     hearing_date = _random_date(rng)
 
     entities = [
         {"name": movant_org, "type": "organization", "role": "defendant" if rng.random() > 0.5 else "plaintiff"},
-        {"name": opponent_org, "type": "organization", "role": "plaintiff" if entities[0]["role"] == "defendant" else "defendant"} if False else {"name": opponent_org, "type": "organization", "role": "opposing party"},
+        {"name": opponent_org, "type": "organization", "role": "opposing party"},
         {"name": court, "type": "court", "role": "adjudicating court"},
         {"name": attorney, "type": "person", "role": "movant's counsel"},
     ]
@@ -348,26 +479,26 @@ def _generate_motion(rng: random.Random) -> tuple[str, dict]:
     ]
 
     relevance_score = round(rng.uniform(0.5, 1.0), 2)
-    categories = rng.sample(RELEVANCE_CATEGORIES, rng.randint(1, 3))
+    categories = sample_distinct(rng, RELEVANCE_CATEGORIES, _randint(rng, 1, 3))
 
     text = (
-        f"IN THE {court.upper()}\n\n"
+        f"IN THE {HEADINGS_UPPER[court]}\n\n"
         f"Case No. {case_no}\n\n"
         f"{movant_org} v. {opponent_org}\n\n"
         f"{'='*60}\n"
-        f"DEFENDANT'S {motion_title.upper()}\n"
+        f"DEFENDANT'S {HEADINGS_UPPER[motion_title]}\n"
         f"{'='*60}\n\n"
         f"Defendant {movant_org}, by and through undersigned counsel, "
         f"respectfully moves this Court for {motion_relief} and states as follows:\n\n"
         f"I. INTRODUCTION\n"
         f"This matter arises from allegations of {case_topic}. "
-        f"Defendant submits that {'the complaint fails to state a claim upon which relief can be granted' if 'Dismiss' in motion_title else 'the relief requested is warranted under the applicable standard'}.\n\n"
+        f"Defendant submits that {position}.\n\n"
         f"II. LEGAL STANDARD\n"
         f"Under the applicable legal framework, the movant must demonstrate "
         f"that the requested relief is appropriate under the circumstances.\n\n"
         f"III. ARGUMENT\n"
-        f"A. The {'complaint' if 'Dismiss' in motion_title else 'evidence'} fails to meet the required standard.\n"
-        f"B. {'Plaintiff has not alleged sufficient facts.' if 'Dismiss' in motion_title else 'The undisputed facts warrant the relief sought.'}\n"
+        f"A. The {challenged} fails to meet the required standard.\n"
+        f"B. {argument}\n"
         f"C. The balance of equities favors the movant.\n\n"
         f"IV. CONCLUSION\n"
         f"For the foregoing reasons, Defendant respectfully requests that this Court "
@@ -401,44 +532,38 @@ def _generate_motion(rng: random.Random) -> tuple[str, dict]:
 
 
 def _generate_brief(rng: random.Random) -> tuple[str, dict]:
-    party_org = rng.choice(ORGANIZATION_NAMES)
-    opposing_org = rng.choice([o for o in ORGANIZATION_NAMES if o != party_org])
+    party_org, opposing_org = _distinct_pair(rng, ORGANIZATION_NAMES)
     court = rng.choice(COURT_NAMES)
     case_topic = rng.choice(CASE_TOPICS)
-    case_no = f"{rng.randint(1, 9)}:{rng.randint(20, 24)}-cv-{rng.randint(1000, 9999)}"
+    case_no = _random_case_no(rng)
     attorney = rng.choice(ATTORNEY_NAMES)
     filing_date = _random_date(rng)
 
-    brief_types = [
-        "Opening Brief in Support of Motion for Summary Judgment",
-        "Opposition Brief to Motion to Dismiss",
-        "Reply Brief in Support of Motion to Compel",
-        "Appellate Brief",
-        "Amicus Curiae Brief",
-    ]
-    brief_title = rng.choice(brief_types)
+    brief_title = rng.choice(BRIEF_TYPES)
 
-    statutes = rng.sample(STATUTE_NAMES, rng.randint(1, 3))
+    statutes = sample_distinct(rng, STATUTE_NAMES, _randint(rng, 1, 3))
 
-    entities = _pick_entities(rng, 3, 5)
-    entities.append({"name": court, "type": "court", "role": "adjudicating court"})
-    for s in statutes:
-        entities.append({"name": s, "type": "statute", "role": "cited authority"})
+    entities = [
+        *_pick_entities(rng, 3, 5),
+        {"name": court, "type": "court", "role": "adjudicating court"},
+        *[{"name": s, "type": "statute", "role": "cited authority"} for s in statutes],
+    ]
 
-    dates = _pick_dates(rng, 2, 4)
-    dates.append({"date": filing_date, "event": "Brief filed"})
+    dates = [*_pick_dates(rng, 2, 4), {"date": filing_date, "event": "Brief filed"}]
 
     relevance_score = round(rng.uniform(0.6, 1.0), 2)
-    categories = rng.sample(RELEVANCE_CATEGORIES, rng.randint(2, 4))
+    categories = sample_distinct(rng, RELEVANCE_CATEGORIES, _randint(rng, 2, 4))
 
     cited_refs = "\n".join(f"  - {s}" for s in statutes)
+    merit = "well-founded" if rng.random() > 0.5 else "without merit"
+    disposition = "should be sustained" if rng.random() > 0.5 else "should be dismissed"
 
     text = (
-        f"IN THE {court.upper()}\n\n"
+        f"IN THE {HEADINGS_UPPER[court]}\n\n"
         f"Case No. {case_no}\n\n"
         f"{party_org} v. {opposing_org}\n\n"
         f"{'='*60}\n"
-        f"{brief_title.upper()}\n"
+        f"{HEADINGS_UPPER[brief_title]}\n"
         f"{'='*60}\n\n"
         f"TABLE OF CONTENTS\n"
         f"I. Introduction ............... 1\n"
@@ -446,7 +571,7 @@ def _generate_brief(rng: random.Random) -> tuple[str, dict]:
         f"III. Legal Argument ........... 4\n"
         f"IV. Conclusion ................ 8\n\n"
         f"I. INTRODUCTION\n"
-        f"{party_org} respectfully submits this {brief_title.lower()} "
+        f"{party_org} respectfully submits this {BRIEF_TYPES_LOWER[brief_title]} "
         f"in the above-captioned {case_topic} matter.\n\n"
         f"II. STATEMENT OF FACTS\n"
         f"The parties entered into a business relationship in which {party_org} "
@@ -454,8 +579,7 @@ def _generate_brief(rng: random.Random) -> tuple[str, dict]:
         f"The relevant facts demonstrate that the applicable legal standard has been met.\n\n"
         f"III. LEGAL ARGUMENT\n"
         f"The applicable legal authorities support the relief sought:\n{cited_refs}\n\n"
-        f"The evidence demonstrates that the claims are {'well-founded' if rng.random() > 0.5 else 'without merit'} "
-        f"and {'should be sustained' if rng.random() > 0.5 else 'should be dismissed'}.\n\n"
+        f"The evidence demonstrates that the claims are {merit} and {disposition}.\n\n"
         f"IV. CONCLUSION\n"
         f"For the foregoing reasons, {party_org} respectfully requests that this Court "
         f"rule in its favor.\n\n"
@@ -488,25 +612,24 @@ def _generate_brief(rng: random.Random) -> tuple[str, dict]:
 
 
 def _generate_opinion(rng: random.Random) -> tuple[str, dict]:
-    plaintiff_org = rng.choice(ORGANIZATION_NAMES)
-    defendant_org = rng.choice([o for o in ORGANIZATION_NAMES if o != plaintiff_org])
+    plaintiff_org, defendant_org = _distinct_pair(rng, ORGANIZATION_NAMES)
     court = rng.choice(COURT_NAMES)
     case_topic = rng.choice(CASE_TOPICS)
-    case_no = f"{rng.randint(1, 9)}:{rng.randint(20, 24)}-cv-{rng.randint(1000, 9999)}"
+    case_no = _random_case_no(rng)
     judge = f"Hon. {rng.choice(PERSON_NAMES)}"
     opinion_date = _random_date(rng)
 
-    outcome = rng.choice(["granted", "denied", "granted in part and denied in part"])
+    outcome = rng.choice(OPINION_OUTCOMES)
+    showing, support = OPINION_FINDINGS[outcome]
 
+    statutes = sample_distinct(rng, STATUTE_NAMES, _randint(rng, 1, 2))
     entities = [
         {"name": plaintiff_org, "type": "organization", "role": "plaintiff"},
         {"name": defendant_org, "type": "organization", "role": "defendant"},
         {"name": court, "type": "court", "role": "adjudicating court"},
         {"name": judge, "type": "person", "role": "judge"},
+        *[{"name": s, "type": "statute", "role": "cited authority"} for s in statutes],
     ]
-    statutes = rng.sample(STATUTE_NAMES, rng.randint(1, 2))
-    for s in statutes:
-        entities.append({"name": s, "type": "statute", "role": "cited authority"})
 
     dates = [
         {"date": opinion_date, "event": "Opinion issued"},
@@ -514,10 +637,10 @@ def _generate_opinion(rng: random.Random) -> tuple[str, dict]:
     ]
 
     relevance_score = round(rng.uniform(0.7, 1.0), 2)
-    categories = rng.sample(RELEVANCE_CATEGORIES, rng.randint(2, 4))
+    categories = sample_distinct(rng, RELEVANCE_CATEGORIES, _randint(rng, 2, 4))
 
     text = (
-        f"IN THE {court.upper()}\n\n"
+        f"IN THE {HEADINGS_UPPER[court]}\n\n"
         f"Case No. {case_no}\n\n"
         f"{plaintiff_org} v. {defendant_org}\n\n"
         f"{'='*60}\n"
@@ -533,9 +656,8 @@ def _generate_opinion(rng: random.Random) -> tuple[str, dict]:
         f"II. LEGAL STANDARD\n"
         f"The Court applies the standard set forth in the applicable authorities.\n\n"
         f"III. ANALYSIS\n"
-        f"Having reviewed the record, the Court finds that the {'plaintiff has' if outcome == 'denied' else 'defendant has'} "
-        f"{'established' if outcome == 'denied' else 'not established'} the requisite showing. "
-        f"The evidence {'supports' if outcome == 'denied' else 'does not support'} the claims as alleged.\n\n"
+        f"Having reviewed the record, the Court finds that the {showing} the requisite showing. "
+        f"The evidence {support} the claims as alleged.\n\n"
         f"IV. CONCLUSION\n"
         f"For the foregoing reasons, the Defendant's motion is {outcome}.\n\n"
         f"IT IS SO ORDERED.\n\n"
@@ -567,17 +689,15 @@ def _generate_opinion(rng: random.Random) -> tuple[str, dict]:
 
 
 def _generate_correspondence(rng: random.Random) -> tuple[str, dict]:
-    sender = rng.choice(ATTORNEY_NAMES)
-    recipient_attorney = rng.choice([a for a in ATTORNEY_NAMES if a != sender])
-    sender_org = rng.choice(ORGANIZATION_NAMES)
-    recipient_org = rng.choice([o for o in ORGANIZATION_NAMES if o != sender_org])
+    sender, recipient_attorney = _distinct_pair(rng, ATTORNEY_NAMES)
+    sender_org, recipient_org = _distinct_pair(rng, ORGANIZATION_NAMES)
     case_topic = rng.choice(CASE_TOPICS)
     letter_date = _random_date(rng)
 
     # Decide privilege
     is_privileged = rng.random() > 0.4
     if is_privileged:
-        privilege_type = rng.choice(["attorney_client", "work_product"])
+        privilege_type = rng.choice(("attorney_client", "work_product"))
     else:
         privilege_type = "none"
 
@@ -599,11 +719,18 @@ def _generate_correspondence(rng: random.Random) -> tuple[str, dict]:
 
     dates = [
         {"date": letter_date, "event": "Letter sent"},
-        {"date": _random_date(rng), "event": rng.choice(["Response deadline", "Meeting proposed", "Hearing date"])},
+        {"date": _random_date(rng), "event": rng.choice(("Response deadline", "Meeting proposed", "Hearing date"))},
     ]
 
     relevance_score = round(rng.uniform(0.3, 0.9), 2)
-    categories = rng.sample(RELEVANCE_CATEGORIES, rng.randint(1, 3))
+    categories = sample_distinct(rng, RELEVANCE_CATEGORIES, _randint(rng, 1, 3))
+
+    client_status = "adversely affected" if rng.random() > 0.5 else "pursuing resolution"
+    next_step = (
+        "request your prompt attention" if rng.random() > 0.5
+        else "propose the following course of action"
+    )
+    response_date = _random_date(rng)
 
     text = (
         f"{'PRIVILEGED AND CONFIDENTIAL' if is_privileged else ''}\n"
@@ -613,13 +740,13 @@ def _generate_correspondence(rng: random.Random) -> tuple[str, dict]:
         f"      Counsel for {sender_org}\n\n"
         f"To:   {recipient_attorney}\n"
         f"      Counsel for {recipient_org}\n\n"
-        f"Re: {sender_org} v. {recipient_org} — {case_topic.title()}\n\n"
+        f"Re: {sender_org} v. {recipient_org} — {CASE_TOPICS_TITLE[case_topic]}\n\n"
         f"Dear {recipient_attorney.split()[-1]},\n\n"
         f"I write to {purpose}.\n\n"
-        f"As you are aware, our client {sender_org} has been {'adversely affected' if rng.random() > 0.5 else 'pursuing resolution'} "
-        f"in this matter. We {'request your prompt attention' if rng.random() > 0.5 else 'propose the following course of action'} "
+        f"As you are aware, our client {sender_org} has been {client_status} "
+        f"in this matter. We {next_step} "
         f"regarding the pending {corr_type} issues.\n\n"
-        f"Please respond by {_random_date(rng)} so that we may proceed accordingly.\n\n"
+        f"Please respond by {response_date} so that we may proceed accordingly.\n\n"
         f"Sincerely,\n"
         f"{sender}\n"
     )
@@ -633,7 +760,7 @@ def _generate_correspondence(rng: random.Random) -> tuple[str, dict]:
         },
         "privilege": {
             "type": privilege_type,
-            "reasoning": rng.choice(PRIVILEGE_REASONING[privilege_type]),
+            "reasoning": _privilege_reasoning(rng, privilege_type),
         },
         "key_entities": entities,
         "dates": dates,
@@ -647,34 +774,38 @@ def _generate_correspondence(rng: random.Random) -> tuple[str, dict]:
 
 
 def _generate_memo(rng: random.Random) -> tuple[str, dict]:
-    author = rng.choice(ATTORNEY_NAMES)
+    # randrange(n) draws exactly as choice() does; the index is kept so the
+    # recipient pool can be sliced around the author instead of filtered.
+    author_idx = rng.randrange(len(ATTORNEY_NAMES))
+    author = ATTORNEY_NAMES[author_idx]
     org = rng.choice(ORGANIZATION_NAMES)
     case_topic = rng.choice(CASE_TOPICS)
     memo_date = _random_date(rng)
 
     # Memos are typically privileged
-    privilege_type = rng.choice(["work_product", "attorney_client", "none"])
-
-    memo_subjects = [
-        (f"Legal analysis of {case_topic} claims", "legal analysis"),
-        (f"Case strategy for upcoming {rng.choice(['deposition', 'hearing', 'mediation', 'trial'])}", "strategy"),
-        (f"Review of document production in {case_topic} matter", "discovery review"),
-        (f"Risk assessment — {case_topic} litigation exposure", "risk assessment"),
-        (f"Summary of witness interviews — {case_topic}", "witness summary"),
-    ]
-    subject, memo_type = rng.choice(memo_subjects)
+    privilege_type = rng.choice(("work_product", "attorney_client", "none"))
 
-    recipients = rng.sample(
-        [a for a in ATTORNEY_NAMES if a != author] + [f"Legal Team at {org}"],
-        rng.randint(1, 3),
+    proceeding = rng.choice(MEMO_PROCEEDINGS)
+    subject_template, memo_type = rng.choice(MEMO_SUBJECTS)
+    subject = subject_template.format(topic=case_topic, proceeding=proceeding)
+
+    recipients = sample_distinct(
+        rng,
+        (*ATTORNEY_NAMES[:author_idx], *ATTORNEY_NAMES[author_idx + 1:], f"Legal Team at {org}"),
+        _randint(rng, 1, 3),
     )
+    recipients_str = ", ".join(recipients)
 
     entities = _pick_entities(rng, 2, 4)
-    dates = _pick_dates(rng, 1, 3)
-    dates.append({"date": memo_date, "event": "Memorandum prepared"})
+    dates = [*_pick_dates(rng, 1, 3), {"date": memo_date, "event": "Memorandum prepared"}]
 
     relevance_score = round(rng.uniform(0.4, 1.0), 2)
-    categories = rng.sample(RELEVANCE_CATEGORIES, rng.randint(1, 3))
+    categories = sample_distinct(rng, RELEVANCE_CATEGORIES, _randint(rng, 1, 3))
+
+    assessment = "strength" if rng.random() > 0.5 else "weakness"
+    assessed_category = rng.choice(RELEVANCE_CATEGORIES)
+    key_risk = "adverse precedent" if rng.random() > 0.5 else "unfavorable facts"
+    course = "Settlement" if rng.random() > 0.5 else "Continued litigation"
 
     text = (
         f"{'PRIVILEGED AND CONFIDENTIAL — ATTORNEY WORK PRODUCT' if privilege_type == 'work_product' else ''}\n"
@@ -683,7 +814,7 @@ def _generate_memo(rng: random.Random) -> tuple[str, dict]:
         f"{'='*60}\n"
         f"Date: {memo_date}\n"
         f"From: {author}\n"
-        f"To:   {', '.join(recipients)}\n"
+        f"To:   {recipients_str}\n"
         f"Re:   {subject}\n"
         f"{'='*60}\n\n"
         f"I. PURPOSE\n"
@@ -693,9 +824,9 @@ def _generate_memo(rng: random.Random) -> tuple[str, dict]:
         f"This memo analyzes the current state of the matter and provides recommendations.\n\n"
         f"III. ANALYSIS\n"
         f"Based on our review of the facts and applicable law, we note the following:\n"
-        f"- The {'strength' if rng.random() > 0.5 else 'weakness'} of the claims relates to {rng.choice(RELEVANCE_CATEGORIES)}.\n"
-        f"- Key risks include {'adverse precedent' if rng.random() > 0.5 else 'unfavorable facts'}.\n"
-        f"- {'Settlement' if rng.random() > 0.5 else 'Continued litigation'} may be advisable.\n\n"
+        f"- The {assessment} of the claims relates to {assessed_category}.\n"
+        f"- Key risks include {key_risk}.\n"
+        f"- {course} may be advisable.\n\n"
         f"IV. RECOMMENDATIONS\n"
         f"We recommend proceeding with the proposed strategy outlined above.\n\n"
         f"Prepared by: {author}\n"
@@ -710,7 +841,7 @@ def _generate_memo(rng: random.Random) -> tuple[str, dict]:
         },
         "privilege": {
             "type": privilege_type,
-            "reasoning": rng.choice(PRIVILEGE_REASONING[privilege_type]),
+            "reasoning": _privilege_reasoning(rng, privilege_type),
         },
         "key_entities": entities,
         "dates": dates,
@@ -725,19 +856,12 @@ def _generate_memo(rng: random.Random) -> tuple[str, dict]:
 
 def _generate_contract_legal(rng: random.Random) -> tuple[str, dict]:
     """Generate a contract document for legal discovery (different focus from contract domain)."""
-    party_a = rng.choice(ORGANIZATION_NAMES)
-    party_b = rng.choice([o for o in ORGANIZATION_NAMES if o != party_a])
+    party_a, party_b = _distinct_pair(rng, ORGANIZATION_NAMES)
     effective_date = _random_date(rng)
     case_topic = rng.choice(CASE_TOPICS)
-    signatory_a = rng.choice(PERSON_NAMES)
-    signatory_b = rng.choice([p for p in PERSON_NAMES if p != signatory_a])
+    signatory_a, signatory_b = _distinct_pair(rng, PERSON_NAMES)
 
-    contract_types = [
-        "Master Services Agreement", "Non-Disclosure Agreement",
-        "Software License Agreement", "Settlement Agreement",
-        "Supply Agreement", "Joint Venture Agreement",
-    ]
-    contract_type = rng.choice(contract_types)
+    contract_type = rng.choice(CONTRACT_TYPES)
 
     entities = [
         {"name": party_a, "type": "organization", "role": "contracting party"},
@@ -753,12 +877,14 @@ def _generate_contract_legal(rng: random.Random) -> tuple[str, dict]:
 
     # Relevance depends on whether contract relates to case topic
     relevance_score = round(rng.uniform(0.3, 0.95), 2)
-    categories = rng.sample(RELEVANCE_CATEGORIES, rng.randint(1, 3))
+    categories = sample_distinct(rng, RELEVANCE_CATEGORIES, _randint(rng, 1, 3))
 
     privilege_type = "none"
+    term_years = rng.choice((1, 2, 3, 5))
+    governing_state = rng.choice(("Delaware", "New York", "California"))
 
     text = (
-        f"{contract_type.upper()}\n"
+        f"{HEADINGS_UPPER[contract_type]}\n"
         f"{'='*60}\n\n"
         f"This {contract_type} (the \"Agreement\") is entered into as of {effective_date} "
         f"by and between:\n\n"
@@ -771,11 +897,11 @@ def _generate_contract_legal(rng: random.Random) -> tuple[str, dict]:
         f"This Agreement governs the terms under which the parties will conduct business.\n\n"
         f"2. TERM\n"
         f"This Agreement shall be effective from {effective_date} and shall continue "
-        f"for a period of {rng.choice([1, 2, 3, 5])} year(s).\n\n"
+        f"for a period of {term_years} year(s).\n\n"
         f"3. CONFIDENTIALITY\n"
         f"Each party shall maintain the confidentiality of the other party's proprietary information.\n\n"
         f"4. GOVERNING LAW\n"
-        f"This Agreement shall be governed by the laws of the State of {rng.choice(['Delaware', 'New York', 'California'])}.\n\n"
+        f"This Agreement shall be governed by the laws of the State of {governing_state}.\n\n"
         f"IN WITNESS WHEREOF, the parties have executed this Agreement.\n\n"
         f"{party_a}: {signatory_a}\n"
         f"{party_b}: {signatory_b}\n"
@@ -808,6 +934,7 @@ def _generate_contract_legal(rng: random.Random) -> tuple[str, dict]:
 # Main generation
 # ---------------------------------------------------------------------------
 
+# Types are assigned per chunk from exact DOC_TYPE_WEIGHTS counts, never drawn per document.
 GENERATORS = {
     "complaint": _generate_complaint,
     "motion": _generate_motion,
@@ -829,32 +956,48 @@ DOC_TYPE_WEIGHTS = {
 }
 
 
-def generate_examples(count: int, seed: int) -> list[dict]:
-    """Generate *count* legal training examples."""
+MAX_EXAMPLE_TOKENS = 4096
+
+# Fixed share of every example's token estimate.  Token estimates are floored
+# per part, so SYSTEM_PROMPT_TOKENS + estimate_tokens(text) never exceeds the
+# estimate of the full example: a document over budget on that sum alone can
+# be skipped before its structured output is serialized.
+SYSTEM_PROMPT_TOKENS = estimate_tokens(SYSTEM_PROMPT)
+
+
+def _generate_chunk(
+    task: tuple[str, int, int, int, str, bool],
+) -> tuple[int, int, dict[str, int]]:
+    """Generate a chunk of one document type into a JSONL shard (pool worker entrypoint).
+
+    Args:
+        task: ``(doc_type, seed, start_idx, n, shard_path, pretty)`` — the
+            document type, the chunk's seed, the run-wide index of its first
+            example (unused), how many examples to attempt, the JSONL file to
+            write them to, and whether the assistant JSON is indented.
+
+    Returns:
+        ``(written, skipped, priv_dist)`` — how many examples were written, how
+        many were dropped for exceeding the token limit, and the privilege
+        type counts of the written examples.
+    """
+    doc_type, seed, _, n, shard_path, pretty = task
     rng = random.Random(seed)
-    examples = []
+    gen_fn = GENERATORS[doc_type]
+    dump_structured = dump_json_indented if pretty else dump_json_line
+    written = 0
     skipped = 0
+    priv_dist: dict[str, int] = {}
 
-    type_counts = {}
-    remaining = count
-    for doc_type, weight in DOC_TYPE_WEIGHTS.items():
-        n = int(count * weight)
-        type_counts[doc_type] = n
-        remaining -= n
-    for doc_type in list(type_counts.keys()):
-        if remaining <= 0:
-            break
-        type_counts[doc_type] += 1
-        remaining -= 1
-
-    for doc_type, n in type_counts.items():
-        gen_fn = GENERATORS[doc_type]
+    with open(shard_path, "wb") as out:
         for _ in range(n):
             text, structured = gen_fn(rng)
-            assistant_content = json.dumps(structured, indent=2, ensure_ascii=False)
+            if SYSTEM_PROMPT_TOKENS + estimate_tokens(text) > MAX_EXAMPLE_TOKENS:
+                skipped += 1
+                continue
 
-            total_text = SYSTEM_PROMPT + text + assistant_content
-            if estimate_tokens(total_text) > 4096:
+            assistant_content = dump_structured(structured)
+            if estimate_tokens_parts(SYSTEM_PROMPT, text, assistant_content) > MAX_EXAMPLE_TOKENS:
                 skipped += 1
                 continue
 
@@ -867,13 +1010,50 @@ def generate_examples(count: int, seed: int) -> list[dict]:
             )
 
             example = make_conversation(SYSTEM_PROMPT, user_msg, assistant_content)
-            examples.append(example)
+            out.write(encode_json_line(example))
+            written += 1
+
+            privilege_type = structured["privilege"]["type"]
+            priv_dist[privilege_type] = priv_dist.get(privilege_type, 0) + 1
+
+    return written, skipped, priv_dist
+
+
+def generate_examples(
+    count: int, seed: int, jsonl_path: str | Path, workers: int = 1, pretty: bool = False
+) -> tuple[dict[str, int], dict[str, int]]:
+    """Generate *count* legal training examples into a JSON Lines file.
+
+    Work is split into seeded per-type chunks and spread over *workers*
+    processes by ``shared.generate_sharded``, which streams each chunk's shard
+    into *jsonl_path*.
+
+    Assistant responses are compact JSON unless *pretty* is set, in which case
+    they are indented by two spaces.
+
+    Returns:
+        ``(type_dist, priv_dist)`` — the number of examples written per
+        document type and per privilege type.
+    """
+    # Per-type counts by largest remainder: floor every quota, then hand the
+    # leftover examples to the types with the largest fractional parts (ties
+    # keep DOC_TYPE_WEIGHTS order; the sort is stable).
+    quotas = {doc_type: count * weight for doc_type, weight in DOC_TYPE_WEIGHTS.items()}
+    type_counts = {doc_type: int(quota) for doc_type, quota in quotas.items()}
+    leftover = count - sum(type_counts.values())
+    by_remainder = sorted(quotas, key=lambda dt: quotas[dt] - type_counts[dt], reverse=True)
+    for doc_type in by_remainder[:leftover]:
+        type_counts[doc_type] += 1
+
+    type_dist, priv_dist, skipped = generate_sharded(
+        _generate_chunk, type_counts, seed, jsonl_path, workers=workers, extra=(pretty,)
+    )
 
     if skipped:
         logger.info("Skipped %d examples (token limit)", skipped)
 
-    logger.info("Generated %d legal examples", len(examples))
-    return examples
+    logger.info("Generated %d legal examples", sum(type_dist.values()))
+    return type_dist, priv_dist
 
 
 # ---------------------------------------------------------------------------
@@ -893,6 +1073,14 @@ def main() -> None:
         "--dry-run", action="store_true",
         help="Generate a small sample (50 examples) for testing",
     )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1,
+        help="Worker processes for generation (default: CPU count)",
+    )
+    parser.add_argument(
+        "--pretty", action="store_true",
+        help="Indent the assistant JSON (default: compact)",
+    )
     add_seed_argument(parser)
     args = parser.parse_args()
 
@@ -902,32 +1090,27 @@ def main() -> None:
         count, args.seed, ", DRY RUN" if args.dry_run else "",
     )
 
-    examples = generate_examples(count, args.seed)
-
     output_dir = DATASETS_DIR / "legal"
-    counts = save_dataset(examples, output_dir, seed=args.seed)
+    with tempfile.TemporaryDirectory(prefix="prepare_legal_") as tmp_dir:
+        jsonl_path = Path(tmp_dir) / "all.jsonl"
+        type_dist, priv_dist = generate_examples(
+            count, args.seed, jsonl_path, workers=args.workers, pretty=args.pretty
+        )
+        counts = save_dataset_from_jsonl([jsonl_path], output_dir, seed=args.seed)
 
     logger.info("Dataset saved to %s", output_dir)
     for split, n in counts.items():
         logger.info("  %s: %d examples", split, n)
 
-    # Distribution
-    type_dist: dict[str, int] = {}
-    priv_dist: dict[str, int] = {}
-    for ex in examples:
-        doc = json.loads(ex["messages"][2]["content"])
-        dt = doc["document_type"]
-        pt = doc["privilege"]["type"]
-        type_dist[dt] = type_dist.get(dt, 0) + 1
-        priv_dist[pt] = priv_dist.get(pt, 0) + 1
-
+    # Distribution, from the per-chunk counters (examples are not re-read)
+    total = sum(counts.values())
     logger.info("Document type distribution:")
     for dt, n in sorted(type_dist.items()):
-        logger.info("  %s: %d (%.1f%%)", dt, n, 100 * n / len(examples))
+        logger.info("  %s: %d (%.1f%%)", dt, n, 100 * n / total)
 
     logger.info("Privilege type distribution:")
     for pt, n in sorted(priv_dist.items()):
-        logger.info("  %s: %d (%.1f%%)", pt, n, 100 * n / len(examples))
+        logger.info("  %s: %d (%.1f%%)", pt, n, 100 * n / total)
 
 
 if __name__ == "__main__":
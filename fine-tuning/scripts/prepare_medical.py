@@ -18,9 +18,10 @@ Usage:
 from __future__ import annotations
 
 import argparse
-import json
+import os
 import random
 import sys
+import tempfile
 from datetime import date, timedelta
 from pathlib import Path
 
@@ -30,9 +31,13 @@ sys.path.insert(0, str(Path(__file__).resolve().parent))
 from shared import (
     DATASETS_DIR,
     add_seed_argument,
-    estimate_tokens,
+    dump_json_indented,
+    encode_json_line,
+    estimate_tokens_parts,
+    generate_sharded,
     make_conversation,
-    save_dataset,
+    sample_distinct,
+    save_dataset_from_jsonl,
     setup_logging,
 )
 
@@ -316,21 +321,21 @@ def _generate_discharge_summary(rng: random.Random, idx: int) -> dict | None:
 
     # Pick diagnoses
     n_diag = rng.randint(1, 4)
-    chosen_diag = rng.sample(DIAGNOSES_POOL, min(n_diag, len(DIAGNOSES_POOL)))
+    chosen_diag = sample_distinct(rng, DIAGNOSES_POOL, min(n_diag, len(DIAGNOSES_POOL)))
     primary = chosen_diag[0]
 
     # Pick medications
     n_meds = rng.randint(2, 7)
-    chosen_meds = rng.sample(MEDICATIONS_POOL, min(n_meds, len(MEDICATIONS_POOL)))
+    chosen_meds = sample_distinct(rng, MEDICATIONS_POOL, min(n_meds, len(MEDICATIONS_POOL)))
 
     # Pick labs
     n_labs = rng.randint(3, 8)
-    chosen_lab_infos = rng.sample(LAB_TESTS_POOL, min(n_labs, len(LAB_TESTS_POOL)))
+    chosen_lab_infos = sample_distinct(rng, LAB_TESTS_POOL, min(n_labs, len(LAB_TESTS_POOL)))
     labs = [_generate_lab_result(rng, info) for info in chosen_lab_infos]
 
     # Pick procedures
     n_proc = rng.randint(1, 3)
-    chosen_procs = rng.sample(PROCEDURES_POOL, min(n_proc, len(PROCEDURES_POOL)))
+    chosen_procs = sample_distinct(rng, PROCEDURES_POOL, min(n_proc, len(PROCEDURES_POOL)))
     procedures = []
     for p in chosen_procs:
         finding_template = rng.choice(PROCEDURE_FINDINGS)
@@ -428,7 +433,7 @@ def _generate_lab_report(rng: random.Random, idx: int) -> tuple:
 
     # Pick labs (more for a dedicated lab report)
     n_labs = rng.randint(5, 15)
-    chosen_lab_infos = rng.sample(LAB_TESTS_POOL, min(n_labs, len(LAB_TESTS_POOL)))
+    chosen_lab_infos = sample_distinct(rng, LAB_TESTS_POOL, min(n_labs, len(LAB_TESTS_POOL)))
     labs = [_generate_lab_result(rng, info) for info in chosen_lab_infos]
 
     abnormal = [l for l in labs if l["flag"] != "normal"]
@@ -492,7 +497,7 @@ def _generate_prescription(rng: random.Random, idx: int) -> tuple:
 
     # Pick 1-4 meds
     n_meds = rng.randint(1, 4)
-    chosen_meds = rng.sample(MEDICATIONS_POOL, min(n_meds, len(MEDICATIONS_POOL)))
+    chosen_meds = sample_distinct(rng, MEDICATIONS_POOL, min(n_meds, len(MEDICATIONS_POOL)))
 
     # Pick a related diagnosis
     diag = rng.choice(DIAGNOSES_POOL)
@@ -512,6 +517,7 @@ def _generate_prescription(rng: random.Random, idx: int) -> tuple:
         f"Instructions: Take as directed. Contact prescriber with any adverse effects."
     )
 
+    med_names = ", ".join(m[0] for m in chosen_meds)
     structured = {
         "document_type": "prescription",
         "patient_info": {"age": str(age), "sex": sex},
@@ -529,7 +535,7 @@ def _generate_prescription(rng: random.Random, idx: int) -> tuple:
         }],
         "summary": (
             f"Prescription for {age}-year-old {sex} with {diag[0]}. "
-            f"{len(chosen_meds)} medication(s) prescribed: {', '.join(m[0] for m in chosen_meds)}."
+            f"{len(chosen_meds)} medication(s) prescribed: {med_names}."
         ),
     }
 
@@ -596,16 +602,16 @@ def _generate_progress_note(rng: random.Random, idx: int) -> tuple:
     specialty = rng.choice(SPECIALTIES)
 
     n_diag = rng.randint(1, 3)
-    chosen_diag = rng.sample(DIAGNOSES_POOL, min(n_diag, len(DIAGNOSES_POOL)))
+    chosen_diag = sample_distinct(rng, DIAGNOSES_POOL, min(n_diag, len(DIAGNOSES_POOL)))
     primary = chosen_diag[0]
 
     n_meds = rng.randint(1, 5)
-    chosen_meds = rng.sample(MEDICATIONS_POOL, min(n_meds, len(MEDICATIONS_POOL)))
+    chosen_meds = sample_distinct(rng, MEDICATIONS_POOL, min(n_meds, len(MEDICATIONS_POOL)))
 
     n_labs = rng.randint(0, 5)
     labs = []
     if n_labs > 0:
-        chosen_lab_infos = rng.sample(LAB_TESTS_POOL, min(n_labs, len(LAB_TESTS_POOL)))
+        chosen_lab_infos = sample_distinct(rng, LAB_TESTS_POOL, min(n_labs, len(LAB_TESTS_POOL)))
         labs = [_generate_lab_result(rng, info) for info in chosen_lab_infos]
 
     pronoun = "He" if sex == "male" else "She"
@@ -625,6 +631,8 @@ def _generate_progress_note(rng: random.Random, idx: int) -> tuple:
         lab_lines = ", ".join(f"{l['test']} {l['value']} {l['unit']}" for l in labs)
         lab_section = f"\nRECENT LABS: {lab_lines}\n"
 
+    diag_names = ", ".join(d[0] for d in chosen_diag)
+
     text = (
         f"PROGRESS NOTE\n"
         f"Provider: {doctor} | {specialty}\n"
@@ -638,7 +646,7 @@ def _generate_progress_note(rng: random.Random, idx: int) -> tuple:
         f"Focused exam consistent with {primary[0].lower()}.\n"
         f"{lab_section}\n"
         f"ASSESSMENT:\n"
-        f"{', '.join(d[0] for d in chosen_diag)} - {'stable' if rng.random() > 0.4 else 'improving'}.\n\n"
+        f"{diag_names} - {'stable' if rng.random() > 0.4 else 'improving'}.\n\n"
         f"PLAN:\n"
         f"Continue current medications. Follow-up in {rng.choice(FOLLOW_UP_TIMEFRAMES)}.\n"
         f"{'Order repeat labs.' if labs else ''}"
@@ -701,41 +709,38 @@ DOC_TYPE_WEIGHTS = {
 }
 
 
-def generate_examples(count: int, seed: int) -> list[dict]:
-    """Generate *count* medical training examples."""
+def _generate_chunk(
+    task: tuple[str, int, int, int, str],
+) -> tuple[int, int, dict[str, int]]:
+    """Generate a chunk of one document type into a JSONL shard (pool worker entrypoint).
+
+    Args:
+        task: ``(doc_type, seed, start_idx, n, shard_path)`` — the document
+            type, the chunk's seed, the run-wide index of its first example,
+            how many examples to attempt, and the JSONL file to write them to.
+
+    Returns:
+        ``(written, skipped, {})`` — how many examples were written and how
+        many were dropped for exceeding the token limit or failing to generate.
+    """
+    doc_type, seed, start_idx, n, shard_path = task
     rng = random.Random(seed)
-    examples = []
+    gen_fn = GENERATORS[doc_type]
+    written = 0
     skipped = 0
 
-    # Pre-compute how many of each type
-    type_counts = {}
-    remaining = count
-    for doc_type, weight in DOC_TYPE_WEIGHTS.items():
-        n = int(count * weight)
-        type_counts[doc_type] = n
-        remaining -= n
-    # Distribute remainder
-    for doc_type in list(type_counts.keys()):
-        if remaining <= 0:
-            break
-        type_counts[doc_type] += 1
-        remaining -= 1
-
-    idx = 0
-    for doc_type, n in type_counts.items():
-        gen_fn = GENERATORS[doc_type]
-        for i in range(n):
+    with open(shard_path, "wb") as out:
+        for idx in range(start_idx, start_idx + n):
             result = gen_fn(rng, idx)
             if result is None:
                 skipped += 1
                 continue
 
             text, structured = result
-            assistant_content = json.dumps(structured, indent=2, ensure_ascii=False)
+            assistant_content = dump_json_indented(structured)
 
             # Token length check — skip outliers > 4096 tokens
-            total_text = SYSTEM_PROMPT + text + assistant_content
-            if estimate_tokens(total_text) > 4096:
+            if estimate_tokens_parts(SYSTEM_PROMPT, text, assistant_content) > 4096:
                 skipped += 1
                 continue
 
@@ -747,14 +752,48 @@ def generate_examples(count: int, seed: int) -> list[dict]:
             )
 
             example = make_conversation(SYSTEM_PROMPT, user_msg, assistant_content)
-            examples.append(example)
-            idx += 1
+            out.write(encode_json_line(example))
+            written += 1
+
+    return written, skipped, {}
+
+
+def generate_examples(
+    count: int, seed: int, jsonl_path: str | Path, workers: int = 1
+) -> dict[str, int]:
+    """Generate *count* medical training examples into a JSON Lines file.
+
+    Work is split into seeded per-type chunks and spread over *workers*
+    processes by ``shared.generate_sharded``, which streams each chunk's shard
+    into *jsonl_path*.
+
+    Returns:
+        The number of examples written per document type.  Types whose
+        examples were all skipped are omitted.
+    """
+    # Pre-compute how many of each type
+    type_counts = {}
+    remaining = count
+    for doc_type, weight in DOC_TYPE_WEIGHTS.items():
+        n = int(count * weight)
+        type_counts[doc_type] = n
+        remaining -= n
+    # Distribute remainder
+    for doc_type in list(type_counts.keys()):
+        if remaining <= 0:
+            break
+        type_counts[doc_type] += 1
+        remaining -= 1
+
+    type_dist, _, skipped = generate_sharded(
+        _generate_chunk, type_counts, seed, jsonl_path, workers=workers
+    )
 
     if skipped:
         logger.info("Skipped %d examples (token limit or generation failure)", skipped)
 
-    logger.info("Generated %d medical examples", len(examples))
-    return examples
+    logger.info("Generated %d medical examples", sum(type_dist.values()))
+    return type_dist
 
 
 # ---------------------------------------------------------------------------
@@ -777,6 +816,12 @@ def main() -> None:
         action="store_true",
         help="Generate a small sample (50 examples) for testing",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes for generation (default: CPU count)",
+    )
     add_seed_argument(parser)
     args = parser.parse_args()
 
@@ -788,25 +833,21 @@ def main() -> None:
         ", DRY RUN" if args.dry_run else "",
     )
 
-    examples = generate_examples(count, args.seed)
-
     output_dir = DATASETS_DIR / "medical"
-    counts = save_dataset(examples, output_dir, seed=args.seed)
+    with tempfile.TemporaryDirectory(prefix="prepare_medical_") as tmp_dir:
+        jsonl_path = Path(tmp_dir) / "all.jsonl"
+        type_dist = generate_examples(count, args.seed, jsonl_path, workers=args.workers)
+        counts = save_dataset_from_jsonl([jsonl_path], output_dir, seed=args.seed)
 
     logger.info("Dataset saved to %s", output_dir)
     for split, n in counts.items():
         logger.info("  %s: %d examples", split, n)
 
-    # Print document type distribution
-    type_dist: dict[str, int] = {}
-    for ex in examples:
-        assistant_msg = ex["messages"][2]["content"]
-        doc = json.loads(assistant_msg)
-        dt = doc["document_type"]
-        type_dist[dt] = type_dist.get(dt, 0) + 1
+    # Print document type distribution (from the per-chunk counters)
+    total = sum(counts.values())
     logger.info("Document type distribution:")
     for dt, n in sorted(type_dist.items()):
-        logger.info("  %s: %d (%.1f%%)", dt, n, 100 * n / len(examples))
+        logger.info("  %s: %d (%.1f%%)", dt, n, 100 * n / total)
 
 
 if __name__ == "__main__":
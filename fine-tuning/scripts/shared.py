@@ -7,21 +7,40 @@ Common functions used by all domain-specific dataset preparation scripts.
 Usage:
     from shared import (
         estimate_tokens,
+        estimate_tokens_parts,
+        estimate_conversation_tokens,
+        dump_json_indented,
+        dump_json_line,
+        encode_json_line,
         make_conversation,
+        sample_distinct,
         save_dataset,
+        save_dataset_from_jsonl,
         load_json_schema,
         setup_logging,
+        derive_task_seed,
+        generate_sharded,
     )
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
+import multiprocessing
+import os
 import random
+import shutil
+from collections.abc import Callable, Iterable, Sequence
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
 # ---------------------------------------------------------------------------
 # Constants
 # ---------------------------------------------------------------------------
@@ -83,6 +102,40 @@ def estimate_tokens(text: str) -> int:
     return max(1, len(text) // 4)
 
 
+def estimate_tokens_parts(*parts: str) -> int:
+    """Estimate the token count of the concatenation of *parts*.
+
+    Equivalent to ``estimate_tokens("".join(parts))`` but sums the part
+    lengths instead of building the joined string.
+
+    Returns:
+        Estimated token count (always >= 0).
+    """
+    n_chars = sum(map(len, parts))
+    if not n_chars:
+        return 0
+    return max(1, n_chars // 4)
+
+
+def estimate_conversation_tokens(conversation: dict[str, list[dict[str, str]]]) -> int:
+    """Estimate the token count of a ChatML conversation.
+
+    Equivalent to ``estimate_tokens("".join(turn contents))`` but sums the
+    turn lengths instead of building the joined string.
+
+    Args:
+        conversation: A dict with a ``"messages"`` list, as produced by
+            :func:`make_conversation`.
+
+    Returns:
+        Estimated token count (always >= 0).
+    """
+    n_chars = sum(len(turn["content"]) for turn in conversation["messages"])
+    if not n_chars:
+        return 0
+    return max(1, n_chars // 4)
+
+
 # ---------------------------------------------------------------------------
 # ChatML conversation builder
 # ---------------------------------------------------------------------------
@@ -124,6 +177,91 @@ def make_conversation(
     }
 
 
+# ---------------------------------------------------------------------------
+# Sampling
+# ---------------------------------------------------------------------------
+
+
+def sample_distinct(rng: random.Random, population: Sequence[Any], k: int) -> list[Any]:
+    """Draw *k* distinct items from *population* (partial Fisher-Yates).
+
+    Same distribution as ``rng.sample``, but for the small pools the prepare
+    scripts sample from about twice as fast: ``random.sample`` spends most of
+    its time choosing between its set- and pool-based strategies.
+
+    Args:
+        rng: The random source.
+        population: The items to draw from.
+        k: How many items to draw (at most ``len(population)``).
+
+    Returns:
+        A new list of *k* items in selection order.
+    """
+    pool = list(population)
+    n = len(pool)
+    rand = rng.random
+    for i in range(k):
+        j = i + int(rand() * (n - i))
+        pool[i], pool[j] = pool[j], pool[i]
+    return pool[:k]
+
+
+# ---------------------------------------------------------------------------
+# JSON serialization
+# ---------------------------------------------------------------------------
+
+# Parses a JSON document from str or bytes.
+_load_json = orjson.loads if orjson is not None else json.loads
+
+# Stdlib fallback encoders, built once: json.dumps with non-default arguments
+# constructs a new JSONEncoder on every call.
+_INDENTED_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False)
+_COMPACT_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def dump_json_indented(obj: Any) -> str:
+    """Serialize *obj* as 2-space indented JSON for an assistant turn.
+
+    Same output as ``json.dumps(obj, indent=2, ensure_ascii=False)`` for the
+    str / int / float / bool / None / list / dict payloads the prepare scripts
+    build, but uses orjson when it is installed (several times faster than the
+    stdlib's pure-Python indenting encoder).
+
+    Args:
+        obj: The JSON-serializable value.
+
+    Returns:
+        The indented JSON text.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return _INDENTED_ENCODER.encode(obj)
+
+
+def dump_json_line(obj: Any) -> str:
+    """Serialize *obj* as one compact JSON line (no trailing newline).
+
+    Used for intermediate JSON Lines files and for compact assistant turns.
+    Uses orjson when it is installed; the stdlib fallback drops the spaces
+    after separators so both produce the same text.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return _COMPACT_ENCODER.encode(obj)
+
+
+def encode_json_line(obj: Any) -> bytes:
+    """Serialize *obj* as one newline-terminated JSON line, as UTF-8 bytes.
+
+    Same output as :func:`dump_json_line` plus ``"\\n"``, for writers that
+    open their JSONL files in binary mode: orjson's bytes go straight to the
+    file without a decode / re-encode round trip through a text wrapper.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return (_COMPACT_ENCODER.encode(obj) + "\n").encode("utf-8")
+
+
 # ---------------------------------------------------------------------------
 # Dataset persistence (shuffle + split + write)
 # ---------------------------------------------------------------------------
@@ -182,6 +320,95 @@ def save_dataset(
     return counts
 
 
+def _dump_json_array(entries: Iterable[str], out_path: Path) -> int:
+    """Write pre-indented JSON array elements to *out_path*.
+
+    Produces the same bytes as ``json.dump(items, f, indent=2)`` for the
+    decoded items.  Returns the number of elements written.
+    """
+    count = 0
+    with open(out_path, "w") as f:
+        for entry in entries:
+            f.write(",\n  " if count else "[\n  ")
+            f.write(entry)
+            count += 1
+        f.write("\n]" if count else "[]")
+    return count
+
+
+def save_dataset_from_jsonl(
+    jsonl_paths: Iterable[str | Path],
+    output_dir: str | Path,
+    *,
+    seed: int = 42,
+    train_ratio: float = 0.8,
+    val_ratio: float = 0.1,
+) -> dict[str, int]:
+    """Shuffle, split, and write a dataset held in JSON Lines files.
+
+    Streaming counterpart of :func:`save_dataset` for scripts that write
+    examples to disk as they are generated.  Only the byte offset of each
+    example is held in memory; examples are read back one at a time while the
+    split files are written.  For the same examples in the same order, the
+    split assignment and output files are identical to ``save_dataset``.
+
+    Args:
+        jsonl_paths: JSONL files whose concatenated lines form the dataset.
+        output_dir: Directory to write the split files into.
+        seed: Random seed for reproducible shuffling.
+        train_ratio: Fraction of data for the training split.
+        val_ratio: Fraction of data for the validation split.
+
+    Returns:
+        A dict mapping split name to example count.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = [Path(p) for p in jsonl_paths]
+
+    index: list[tuple[int, int]] = []
+    for file_idx, path in enumerate(paths):
+        offset = 0
+        with open(path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    index.append((file_idx, offset))
+                offset += len(line)
+
+    rng = random.Random(seed)
+    rng.shuffle(index)
+
+    n = len(index)
+    n_train = int(n * train_ratio)
+    n_val = int(n * val_ratio)
+
+    splits = {
+        "train": index[:n_train],
+        "validation": index[n_train : n_train + n_val],
+        "test": index[n_train + n_val :],
+    }
+
+    handles = [open(path, "rb") for path in paths]
+    try:
+
+        def entries(split_index: list[tuple[int, int]]) -> Iterable[str]:
+            for file_idx, offset in split_index:
+                f = handles[file_idx]
+                f.seek(offset)
+                example = _load_json(f.readline())
+                yield dump_json_indented(example).replace("\n", "\n  ")
+
+        counts: dict[str, int] = {}
+        for split_name, split_index in splits.items():
+            out_path = output_dir / f"{split_name}.json"
+            counts[split_name] = _dump_json_array(entries(split_index), out_path)
+    finally:
+        for f in handles:
+            f.close()
+
+    return counts
+
+
 # ---------------------------------------------------------------------------
 # Schema loading
 # ---------------------------------------------------------------------------
@@ -224,7 +451,7 @@ def load_json_schema(domain: str) -> dict[str, Any]:
 
 
 # ---------------------------------------------------------------------------
-# Seed-aware argparse helper
+# Seed helpers
 # ---------------------------------------------------------------------------
 
 
@@ -242,3 +469,119 @@ def add_seed_argument(parser: "argparse.ArgumentParser") -> None:
         default=42,
         help="Random seed for reproducibility (default: 42)",
     )
+
+
+def derive_task_seed(seed: int, task_idx: int) -> int:
+    """Derive the 128-bit seed for task *task_idx* of a run seeded with *seed*.
+
+    Each task's stream is keyed on ``(seed, task_idx)`` alone — the same idea
+    as ``numpy.random.SeedSequence.spawn`` — so streams are reproducible,
+    independent of each other, and free of the collisions 32-bit seeds drawn
+    from one parent RNG would eventually hit at large ``--count``.
+
+    Args:
+        seed: The run's ``--seed``.
+        task_idx: Position of the task in the run's (ordered) task list.
+
+    Returns:
+        A non-negative integer suitable for ``random.Random``.
+    """
+    digest = hashlib.blake2b(f"{seed}:{task_idx}".encode(), digest_size=16).digest()
+    return int.from_bytes(digest, "little")
+
+
+# ---------------------------------------------------------------------------
+# Parallel generation
+# ---------------------------------------------------------------------------
+
+# Examples per generation task.  Every task carries its own seed, so a
+# generated dataset depends only on --seed, never on the number of workers.
+GENERATION_CHUNK_SIZE = 250
+
+
+def generate_sharded(
+    chunk_fn: Callable[[tuple], tuple[int, int, dict[str, int]]],
+    type_counts: dict[str, int],
+    seed: int,
+    jsonl_path: str | Path,
+    workers: int = 1,
+    extra: tuple = (),
+) -> tuple[dict[str, int], dict[str, int], int]:
+    """Generate per-type examples in seeded chunks and stream them into *jsonl_path*.
+
+    Each type's count in *type_counts* is split into chunks of
+    ``GENERATION_CHUNK_SIZE``.  Chunk *i* becomes the task ``(doc_type,
+    derive_task_seed(seed, i), start_idx, n, shard_path, *extra)``, where
+    *start_idx* is the run-wide index of its first example.  *chunk_fn* (a
+    module-level pool worker entrypoint) writes up to *n* examples to
+    *shard_path* as JSON Lines and returns ``(written, skipped, stats)``.
+
+    Tasks run on up to *workers* processes.  With ``imap`` the parent copies
+    each finished shard into *jsonl_path*, in task order, while later chunks
+    are still being generated; no example is held in memory or pickled
+    between processes.
+
+    Args:
+        chunk_fn: Generates one chunk into its shard.
+        type_counts: Number of examples to attempt per document type.
+        seed: The run's ``--seed``.
+        jsonl_path: The JSON Lines file to write; shards are staged next to it.
+        workers: Maximum number of worker processes.
+        extra: Trailing fields appended to every task tuple.
+
+    Returns:
+        ``(type_dist, stats, skipped)`` — examples written per document type
+        (types with none written are omitted), the chunks' *stats* summed by
+        key, and the total number of skipped examples.
+    """
+    jsonl_path = Path(jsonl_path)
+
+    chunks = []
+    start_idx = 0
+    for doc_type, n in type_counts.items():
+        for start in range(0, n, GENERATION_CHUNK_SIZE):
+            size = min(GENERATION_CHUNK_SIZE, n - start)
+            chunks.append((doc_type, start_idx, size))
+            start_idx += size
+    tasks = [
+        (
+            doc_type,
+            derive_task_seed(seed, task_idx),
+            chunk_start,
+            size,
+            str(jsonl_path.with_name(f"{jsonl_path.stem}.{task_idx:06d}.jsonl")),
+            *extra,
+        )
+        for task_idx, (doc_type, chunk_start, size) in enumerate(chunks)
+    ]
+    # Small runs (e.g. --dry-run) still split into one short task per type;
+    # cap workers at the number of full chunks' worth of examples so they
+    # are not spread over processes that cost more to start than to run.
+    full_chunks = -(-start_idx // GENERATION_CHUNK_SIZE)
+    workers = max(1, min(workers, len(tasks), full_chunks))
+
+    pool = multiprocessing.Pool(processes=workers) if workers > 1 else None
+    results = pool.imap(chunk_fn, tasks) if pool else map(chunk_fn, tasks)
+
+    type_dist: dict[str, int] = {}
+    stats: dict[str, int] = {}
+    skipped = 0
+    try:
+        with open(jsonl_path, "wb") as out:
+            for task, (written, chunk_skipped, chunk_stats) in zip(tasks, results):
+                doc_type, shard_path = task[0], task[4]
+                with open(shard_path, "rb") as shard:
+                    shutil.copyfileobj(shard, out)
+                os.remove(shard_path)
+                if written:
+                    type_dist[doc_type] = type_dist.get(doc_type, 0) + written
+                for key, n in chunk_stats.items():
+                    stats[key] = stats.get(key, 0) + n
+                skipped += chunk_skipped
+    finally:
+        if pool is not None:
+            # Every result is consumed on success; on error, drop queued tasks.
+            pool.terminate()
+            pool.join()
+
+    return type_dist, stats, skipped